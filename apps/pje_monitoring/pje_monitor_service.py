@@ -617,9 +617,13 @@ def monitorar_publicacoes_advogado(self, advogado_id):
 
         # Executar busca de forma assíncrona
         loop = asyncio.get_event_loop()
-        resultado = loop.run_until_complete(
-            service.buscar_publicacoes_para_advogado(advogado_id)
-        )
+        try:
+            resultado = loop.run_until_complete(
+                service.buscar_publicacoes_para_advogado(advogado_id)
+            )
+        finally:
+            # Fechar o cliente HTTP do scraper no mesmo loop em que foi criado
+            loop.run_until_complete(service.scraper.aclose())
 
         # Processar publicações encontradas
         total, novas = service.processar_publicacoes(advogado_id, resultado)
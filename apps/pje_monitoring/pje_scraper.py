@@ -11,23 +11,29 @@ processando os resultados para extração de informações relevantes.
 
 import os
 import re
+import hashlib
 import time
-import json
 import asyncio
 import logging
 from datetime import datetime, timedelta
+from concurrent.futures import Executor
 from typing import Dict, List, Optional, Union, Any, Tuple
 from urllib.parse import urlencode
 
 import httpx
-from selectolax.parser import HTMLParser
+import orjson
 from pydantic import BaseModel, Field, validator
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
+
+try:
+    # Backend Lexbor: mesma API do parser Modest, com parsing mais rápido
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # selectolax compilado sem o Lexbor
+    from selectolax.parser import HTMLParser
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp é opcional (PJeScraper(use_aiohttp=True))
+    aiohttp = None
 
 # Configuração de logging
 logging.basicConfig(
@@ -40,7 +46,65 @@ BASE_URL = "https://comunica.pje.jus.br/consulta"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 DEFAULT_TIMEOUT = 30.0  # segundos
 MAX_RETRIES = 3
+MAX_CONCURRENCY = 5  # páginas buscadas em paralelo
 RATE_LIMIT_DELAY = 1.0  # segundos entre requisições
+MAX_RETRY_DELAY = 10.0  # espera máxima entre tentativas, em segundos
+
+# Datas no formato dd/mm/aaaa, dd-mm-aaaa ou aaaa-mm-dd
+_DATE_RE = re.compile(r"(\d{2,4})[/\-](\d{2})[/\-](\d{2,4})")
+_DATE_FORMATOS = ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y")
+
+_NONDIGIT = re.compile(r"\D")
+# fmt: off
+_UFS_VALIDAS = frozenset({
+    "AC", "AL", "AM", "AP", "BA", "CE", "DF", "ES", "GO",
+    "MA", "MG", "MS", "MT", "PA", "PB", "PE", "PI", "PR",
+    "RJ", "RN", "RO", "RR", "RS", "SC", "SE", "SP", "TO",
+})
+# fmt: on
+# Indicadores de captcha e de página inexistente, buscados sem copiar o HTML.
+# As variantes em bytes atuam direto no corpo da resposta (UTF-8).
+_CAPTCHA_PADRAO = "captcha|verificação de segurança|prove que você é humano|robot"
+_404_PADRAO = "404|não encontrada|not found|página inexistente"
+_CAPTCHA_RE = re.compile(_CAPTCHA_PADRAO, re.IGNORECASE)
+_404_RE = re.compile(_404_PADRAO, re.IGNORECASE)
+
+
+def _padrao_bytes(padrao: str) -> bytes:
+    """
+    Converte um padrão de texto em padrão de bytes UTF-8 sem perder acentos.
+
+    Em padrões de bytes, re.IGNORECASE só trata letras ASCII; cada caractere
+    acentuado vira uma alternativa explícita entre suas formas minúscula e
+    maiúscula (ex: "ã" casa "ã" e "Ã").
+    """
+    partes = []
+    for caractere in padrao:
+        if caractere.isascii():
+            partes.append(caractere.encode())
+        else:
+            formas = dict.fromkeys((caractere.lower(), caractere.upper()))
+            partes.append(
+                b"(?:" + b"|".join(re.escape(forma.encode()) for forma in formas) + b")"
+            )
+    return b"".join(partes)
+
+
+_CAPTCHA_RE_BYTES = re.compile(_padrao_bytes(_CAPTCHA_PADRAO), re.IGNORECASE)
+_404_RE_BYTES = re.compile(_padrao_bytes(_404_PADRAO), re.IGNORECASE)
+_UTF8_CHARSETS = frozenset({"utf-8", "utf8"})
+# Texto de paginação como "Exibindo 1-50 de 320 resultados"
+_PAG_RE = re.compile(r"de\s+(\d+)\s+resultados")
+
+
+def formatar_numero_processo(numero: str) -> str:
+    """Formata o número do processo no padrão CNJ, se tiver 20 dígitos."""
+    # Remove caracteres não numéricos
+    nums = _NONDIGIT.sub("", numero)
+    if len(nums) == 20:
+        # Formata no padrão CNJ: NNNNNNN-DD.AAAA.J.TR.OOOO
+        return f"{nums[0:7]}-{nums[7:9]}.{nums[9:13]}.{nums[13:14]}.{nums[14:16]}.{nums[16:20]}"
+    return numero
 
 
 # Modelos de dados
@@ -63,19 +127,15 @@ class Publicacao(BaseModel):
     @validator("numero_processo")
     def validar_numero_processo(cls, v):
         """Valida e formata o número do processo no padrão CNJ."""
-        # Remove caracteres não numéricos
-        nums = re.sub(r"\D", "", v)
-        if len(nums) == 20:
-            # Formata no padrão CNJ: NNNNNNN-DD.AAAA.J.TR.OOOO
-            return f"{nums[0:7]}-{nums[7:9]}.{nums[9:13]}.{nums[13:14]}.{nums[14:16]}.{nums[16:20]}"
-        return v
+        return formatar_numero_processo(v)
 
     def calcular_hash(self) -> str:
         """Calcula um hash único para a publicação baseado em seus atributos."""
-        import hashlib
-
+        # O hash é gravado em PublicacaoMonitorada.hash e usado para deduplicar
+        # entre execuções; trocar o algoritmo faria publicações já registradas
+        # parecerem novas. MD5 aqui é só identificador, não uso criptográfico.
         texto = f"{self.numero_processo}|{self.data_publicacao.isoformat()}|{self.orgao_julgador}"
-        return hashlib.md5(texto.encode()).hexdigest()
+        return hashlib.md5(texto.encode(), usedforsecurity=False).hexdigest()
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -109,36 +169,7 @@ class ConfiguracaoBusca(BaseModel):
     def validar_uf(cls, v):
         """Valida a UF, convertendo para maiúsculas."""
         v = v.upper()
-        ufs_validas = [
-            "AC",
-            "AL",
-            "AM",
-            "AP",
-            "BA",
-            "CE",
-            "DF",
-            "ES",
-            "GO",
-            "MA",
-            "MG",
-            "MS",
-            "MT",
-            "PA",
-            "PB",
-            "PE",
-            "PI",
-            "PR",
-            "RJ",
-            "RN",
-            "RO",
-            "RR",
-            "RS",
-            "SC",
-            "SE",
-            "SP",
-            "TO",
-        ]
-        if v not in ufs_validas:
+        if v not in _UFS_VALIDAS:
             raise ValueError(f"UF inválida: {v}")
         return v
 
@@ -169,7 +200,19 @@ class PJeScraperException(Exception):
 class ConexaoException(PJeScraperException):
     """Exceção para erros de conexão."""
 
-    pass
+    def __init__(self, mensagem: str, status_code: Optional[int] = None):
+        super().__init__(mensagem)
+        # Status HTTP da resposta de erro (None em falhas de transporte)
+        self.status_code = status_code
+
+    @property
+    def retentavel(self) -> bool:
+        """Falhas de transporte, 5xx e 429 são transitórias; demais 4xx, não."""
+        return (
+            self.status_code is None
+            or self.status_code == 429
+            or self.status_code >= 500
+        )
 
 
 class ParsingException(PJeScraperException):
@@ -191,123 +234,150 @@ class PaginaNaoEncontradaException(PJeScraperException):
 
 
 # Funções de parsing HTML
-def extrair_dados_publicacao(elemento_html) -> Optional[Dict[str, Any]]:
+# Seletores CSS de cada campo da publicação, definidos uma única vez no módulo
+_SELETOR_NUMERO_PROCESSO = "div.numero-processo, span.processo-numero"
+_SELETOR_DATA = "div.data-publicacao, span.data"
+_SELETOR_ORGAO = "div.orgao-julgador, span.orgao"
+_SELETOR_CONTEUDO = "div.conteudo-publicacao, div.texto-publicacao"
+_SELETOR_TRIBUNAL = "div.tribunal"
+_SELETOR_LINK = "a.link-processo"
+
+
+def converter_data(data_texto: str) -> Optional[datetime]:
+    """
+    Converte o texto de data de uma publicação.
+
+    Tenta primeiro a regex pré-compilada e só recorre ao ``strptime`` (mais
+    lento) para textos que ela não reconhece, como dias com um dígito.
+
+    Args:
+        data_texto: Texto contendo a data
+
+    Returns:
+        datetime ou None se não for possível converter
+    """
+    match = _DATE_RE.search(data_texto)
+    if match:
+        primeiro, mes, ultimo = match.groups()
+        if len(primeiro) == 4 and len(ultimo) == 2:
+            ano, dia = primeiro, ultimo
+        elif len(primeiro) == 2 and len(ultimo) == 4:
+            dia, ano = primeiro, ultimo
+        else:
+            ano = None
+        if ano is not None:
+            try:
+                return datetime(int(ano), int(mes), int(dia))
+            except ValueError:
+                pass
+
+    for formato in _DATE_FORMATOS:
+        try:
+            return datetime.strptime(data_texto, formato)
+        except ValueError:
+            continue
+    return None
+
+
+def extrair_dados_publicacao(elemento_html) -> Optional[Publicacao]:
     """
     Extrai dados de uma publicação a partir de um elemento HTML.
 
+    Os dados extraídos já têm os tipos corretos, então o modelo é montado com
+    ``model_construct``, sem passar pela validação do Pydantic.
+
     Args:
         elemento_html: Elemento HTML contendo os dados da publicação
 
     Returns:
-        Dict contendo os dados extraídos ou None se não for possível extrair
+        Publicacao com os dados extraídos ou None se não for possível extrair
     """
     try:
         # Nota: A estrutura exata do HTML pode variar, este é um exemplo
         # que precisará ser ajustado conforme a estrutura real do site
 
         # Extrair número do processo
-        numero_processo_elem = elemento_html.css_first("div.numero-processo")
-        if not numero_processo_elem:
-            numero_processo_elem = elemento_html.css_first("span.processo-numero")
-
+        numero_processo_elem = elemento_html.css_first(_SELETOR_NUMERO_PROCESSO)
         numero_processo = (
-            numero_processo_elem.text().strip() if numero_processo_elem else "N/A"
+            formatar_numero_processo(numero_processo_elem.text().strip())
+            if numero_processo_elem
+            else "N/A"
         )
 
         # Extrair data da publicação
-        data_elem = elemento_html.css_first("div.data-publicacao")
-        if not data_elem:
-            data_elem = elemento_html.css_first("span.data")
-
+        data_elem = elemento_html.css_first(_SELETOR_DATA)
         data_texto = data_elem.text().strip() if data_elem else ""
-        data_publicacao = None
-
-        # Tentar diferentes formatos de data
-        data_formatos = ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"]
-        for formato in data_formatos:
-            try:
-                data_publicacao = datetime.strptime(data_texto, formato)
-                break
-            except ValueError:
-                continue
-
-        if not data_publicacao and data_texto:
-            # Tentar extrair com regex se os formatos padrão falharem
-            match = re.search(r"(\d{2})[/\-](\d{2})[/\-](\d{4})", data_texto)
-            if match:
-                dia, mes, ano = match.groups()
-                data_publicacao = datetime(int(ano), int(mes), int(dia))
+        data_publicacao = converter_data(data_texto) if data_texto else None
 
         if not data_publicacao:
             data_publicacao = datetime.now()  # Fallback para data atual
 
         # Extrair órgão julgador
-        orgao_elem = elemento_html.css_first("div.orgao-julgador")
-        if not orgao_elem:
-            orgao_elem = elemento_html.css_first("span.orgao")
-
+        orgao_elem = elemento_html.css_first(_SELETOR_ORGAO)
         orgao_julgador = orgao_elem.text().strip() if orgao_elem else "N/A"
 
         # Extrair conteúdo da publicação
-        conteudo_elem = elemento_html.css_first("div.conteudo-publicacao")
-        if not conteudo_elem:
-            conteudo_elem = elemento_html.css_first("div.texto-publicacao")
-
+        conteudo_elem = elemento_html.css_first(_SELETOR_CONTEUDO)
         conteudo = conteudo_elem.text().strip() if conteudo_elem else "N/A"
 
         # Extrair tribunal
-        tribunal_elem = elemento_html.css_first("div.tribunal")
+        tribunal_elem = elemento_html.css_first(_SELETOR_TRIBUNAL)
         tribunal = tribunal_elem.text().strip() if tribunal_elem else "N/A"
 
         # Extrair URL do processo, se disponível
         url_processo = None
-        link_elem = elemento_html.css_first("a.link-processo")
+        link_elem = elemento_html.css_first(_SELETOR_LINK)
         if link_elem and link_elem.attributes.get("href"):
             url_processo = link_elem.attributes.get("href")
 
-        return {
-            "numero_processo": numero_processo,
-            "data_publicacao": data_publicacao,
-            "orgao_julgador": orgao_julgador,
-            "conteudo": conteudo,
-            "tribunal": tribunal,
-            "url_processo": url_processo,
-        }
+        publicacao = Publicacao.model_construct(
+            numero_processo=numero_processo,
+            data_publicacao=data_publicacao,
+            orgao_julgador=orgao_julgador,
+            conteudo=conteudo,
+            tribunal=tribunal,
+            url_processo=url_processo,
+        )
+        publicacao.hash = publicacao.calcular_hash()
+        return publicacao
     except Exception as e:
         logger.error(f"Erro ao extrair dados da publicação: {str(e)}")
         return None
 
 
-def extrair_informacoes_paginacao(html_parser) -> Tuple[int, int, int]:
+def extrair_informacoes_paginacao(
+    html_parser, itens_por_pagina: int = 50
+) -> Tuple[int, int, int]:
     """
     Extrai informações de paginação do HTML.
 
     Args:
         html_parser: Parser HTML da página
+        itens_por_pagina: Tamanho de página usado na busca
 
     Returns:
         Tupla (total_encontrado, pagina_atual, total_paginas)
     """
     try:
         # Buscar elemento de paginação
-        paginacao_elem = html_parser.css_first("div.paginacao")
-        if not paginacao_elem:
-            paginacao_elem = html_parser.css_first("ul.pagination")
+        paginacao_elem = html_parser.css_first("div.paginacao, ul.pagination")
 
         if not paginacao_elem:
             return 0, 1, 1
 
         # Extrair informações de texto como "Exibindo 1-50 de 320 resultados"
-        info_texto = paginacao_elem.text()
-        match = re.search(r"de\s+(\d+)\s+resultados", info_texto)
+        match = _PAG_RE.search(paginacao_elem.text())
         total_encontrado = int(match.group(1)) if match else 0
 
-        # Extrair página atual
-        pagina_atual_elem = html_parser.css_first("li.active span")
+        # Extrair página atual: primeiro dentro do bloco de paginação já
+        # localizado; em layouts com o item ativo fora dele, na página inteira
+        pagina_atual_elem = paginacao_elem.css_first(
+            "li.active span"
+        ) or html_parser.css_first("li.active span")
         pagina_atual = int(pagina_atual_elem.text()) if pagina_atual_elem else 1
 
-        # Calcular total de páginas
-        total_paginas = (total_encontrado + 49) // 50  # Assumindo 50 itens por página
+        # Calcular total de páginas com o tamanho de página da busca
+        total_paginas = (total_encontrado + itens_por_pagina - 1) // itens_por_pagina
 
         return total_encontrado, pagina_atual, total_paginas
     except Exception as e:
@@ -315,43 +385,107 @@ def extrair_informacoes_paginacao(html_parser) -> Tuple[int, int, int]:
         return 0, 1, 1
 
 
-def verificar_captcha(html_content: str) -> bool:
+def verificar_captcha(html_content: Union[str, bytes]) -> bool:
     """
     Verifica se a página contém um captcha.
 
     Args:
-        html_content: Conteúdo HTML da página
+        html_content: Conteúdo HTML da página (texto ou bytes UTF-8)
 
     Returns:
         True se um captcha for detectado, False caso contrário
     """
-    captcha_indicators = [
-        "captcha",
-        "recaptcha",
-        "g-recaptcha",
-        "Verificação de segurança",
-        "Prove que você é humano",
-        "robot",
-    ]
+    padrao = _CAPTCHA_RE_BYTES if isinstance(html_content, bytes) else _CAPTCHA_RE
+    return padrao.search(html_content) is not None
 
-    html_lower = html_content.lower()
-    return any(indicator in html_lower for indicator in captcha_indicators)
 
-
-def verificar_erro_404(html_content: str) -> bool:
+def verificar_erro_404(html_content: Union[str, bytes]) -> bool:
     """
     Verifica se a página retornou um erro 404.
 
     Args:
-        html_content: Conteúdo HTML da página
+        html_content: Conteúdo HTML da página (texto ou bytes UTF-8)
 
     Returns:
         True se um erro 404 for detectado, False caso contrário
     """
-    not_found_indicators = ["404", "não encontrada", "not found", "página inexistente"]
+    padrao = _404_RE_BYTES if isinstance(html_content, bytes) else _404_RE
+    return padrao.search(html_content) is not None
+
+
+def corpo_html(content: bytes, charset: Optional[str]) -> Union[str, bytes]:
+    """
+    Prepara o corpo da resposta para a detecção de captcha/404 e o parser.
+
+    Respostas em UTF-8 (ou sem charset declarado) seguem como bytes: o
+    selectolax decodifica em C, sem criar uma cópia ``str`` da página.
+    Outros charsets são decodificados aqui.
+
+    Args:
+        content: Corpo da resposta
+        charset: Charset declarado no Content-Type, se houver
+
+    Returns:
+        O corpo em bytes (UTF-8) ou já decodificado
+    """
+    if charset is None or charset.lower() in _UTF8_CHARSETS:
+        return content
+    return content.decode(charset, errors="replace")
+
+
+def processar_html(
+    html_content: Union[str, bytes], config: ConfiguracaoBusca
+) -> ResultadoBusca:
+    """
+    Processa o HTML para extrair publicações e informações de paginação.
+
+    Função de módulo (e não método) para poder ser enviada a um
+    ``ProcessPoolExecutor``.
+
+    Args:
+        html_content: Conteúdo HTML da página (texto ou bytes UTF-8)
+        config: Configuração da busca
+
+    Returns:
+        ResultadoBusca contendo as publicações encontradas e metadados
+
+    Raises:
+        ParsingException: Se houver erro no parsing do HTML
+    """
+    try:
+        parser = HTMLParser(html_content)
 
-    html_lower = html_content.lower()
-    return any(indicator in html_lower for indicator in not_found_indicators)
+        # Extrair informações de paginação
+        total_encontrado, pagina_atual, total_paginas = (
+            extrair_informacoes_paginacao(parser, config.itens_por_pagina)
+        )
+
+        # Buscar elementos de publicação
+        # Nota: O seletor CSS exato depende da estrutura do site
+        elementos_publicacao = parser.css("div.publicacao")
+        if not elementos_publicacao:
+            elementos_publicacao = parser.css("div.resultado-item")
+
+        if not elementos_publicacao:
+            logger.warning("Nenhum elemento de publicação encontrado no HTML")
+
+        # Extrair dados de cada publicação
+        publicacoes = []
+        for elem in elementos_publicacao:
+            publicacao = extrair_dados_publicacao(elem)
+            if publicacao is not None:
+                publicacoes.append(publicacao)
+
+        return ResultadoBusca(
+            publicacoes=publicacoes,
+            total_encontrado=total_encontrado,
+            pagina_atual=pagina_atual,
+            total_paginas=total_paginas,
+            parametros_busca=config.dict(),
+        )
+    except Exception as e:
+        logger.error(f"Erro ao processar HTML: {str(e)}")
+        raise ParsingException(f"Erro ao processar HTML: {str(e)}")
 
 
 # Classe principal do scraper
@@ -363,12 +497,30 @@ class PJeScraper:
     a partir do site https://comunica.pje.jus.br/consulta.
     """
 
+    __slots__ = (
+        "proxy",
+        "timeout",
+        "max_retries",
+        "rate_limit",
+        "max_concurrency",
+        "parse_executor",
+        "last_request_time",
+        "use_aiohttp",
+        "headers",
+        "_async_client",
+        "_sync_client",
+        "_session",
+    )
+
     def __init__(
         self,
         proxy: Optional[str] = None,
         timeout: float = DEFAULT_TIMEOUT,
         max_retries: int = MAX_RETRIES,
         rate_limit: float = RATE_LIMIT_DELAY,
+        use_aiohttp: bool = False,
+        max_concurrency: int = MAX_CONCURRENCY,
+        parse_executor: Optional[Executor] = None,
     ):
         """
         Inicializa o scraper do PJe.
@@ -378,13 +530,25 @@ class PJeScraper:
             timeout: Timeout para requisições em segundos
             max_retries: Número máximo de tentativas para requisições
             rate_limit: Delay entre requisições em segundos
+            use_aiohttp: Usar aiohttp nas requisições assíncronas (menor
+                variação de latência com muitas páginas em paralelo)
+            max_concurrency: Máximo de páginas buscadas ao mesmo tempo
+            parse_executor: Executor para o parsing do HTML nas buscas
+                assíncronas (ex: ProcessPoolExecutor em buscas grandes);
+                por padrão, o pool de threads do event loop
         """
         self.proxy = proxy
         self.timeout = timeout
         self.max_retries = max_retries
         self.rate_limit = rate_limit
+        self.max_concurrency = max_concurrency
+        self.parse_executor = parse_executor
         self.last_request_time = 0
 
+        if use_aiohttp and aiohttp is None:
+            logger.warning("aiohttp não disponível. Usando httpx nas requisições.")
+        self.use_aiohttp = use_aiohttp and aiohttp is not None
+
         # Headers padrão para simular um navegador
         self.headers = {
             "User-Agent": USER_AGENT,
@@ -396,25 +560,120 @@ class PJeScraper:
             "TE": "Trailers",
         }
 
-    def _aplicar_rate_limit(self):
+        # Clientes HTTP criados no primeiro uso e reaproveitados entre
+        # requisições (keep-alive e reuso da sessão TLS)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._session = None  # aiohttp.ClientSession, se use_aiohttp
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                proxies=self.proxy,
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._async_client
+
+    def _get_sync_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(
+                proxies=self.proxy,
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._sync_client
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20, limit_per_host=10, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers,
+            )
+        return self._session
+
+    async def aclose(self):
+        """Fecha os clientes HTTP abertos pelo scraper."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.close()
+
+    def close(self):
+        """Fecha o cliente HTTP síncrono, se aberto."""
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _aplicar_rate_limit_sync(self):
         """
         Aplica rate limiting para evitar sobrecarga do servidor.
         """
-        agora = time.time()
+        agora = time.monotonic()
         tempo_desde_ultima_req = agora - self.last_request_time
 
         if tempo_desde_ultima_req < self.rate_limit:
             time.sleep(self.rate_limit - tempo_desde_ultima_req)
 
-        self.last_request_time = time.time()
+        self.last_request_time = time.monotonic()
 
-    @retry(
-        stop=stop_after_attempt(MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-        reraise=True,
-    )
-    async def _fazer_requisicao_async(self, url: str, params: Dict[str, str]) -> str:
+    async def _aplicar_rate_limit_async(self):
+        """
+        Aplica rate limiting sem bloquear o event loop.
+
+        Cada chamada reserva o próximo horário livre antes de dormir, então
+        requisições concorrentes ficam espaçadas de ``rate_limit`` entre si.
+        A leitura e a escrita de ``last_request_time`` não têm ``await`` entre
+        elas, portanto não há disputa entre corrotinas.
+        """
+        agora = time.monotonic()
+        espera = max(0.0, self.last_request_time + self.rate_limit - agora)
+        self.last_request_time = agora + espera
+
+        if espera:
+            await asyncio.sleep(espera)
+
+    def _espera_nova_tentativa(
+        self, tentativa: int, erro: Exception
+    ) -> Optional[float]:
+        """
+        Tempo de espera antes da próxima tentativa (backoff exponencial), ou
+        None se as tentativas se esgotaram ou o erro não é transitório.
+        """
+        if not erro.retentavel or tentativa + 1 >= self.max_retries:
+            return None
+        espera = min(MAX_RETRY_DELAY, 2.0**tentativa)
+        logger.warning(
+            f"Tentativa {tentativa + 1} de {self.max_retries} falhou ({erro}); "
+            f"nova tentativa em {espera:.0f}s"
+        )
+        return espera
+
+    async def _fazer_requisicao_async(
+        self, url: str, params: Dict[str, str]
+    ) -> Union[str, bytes]:
         """
         Faz uma requisição HTTP assíncrona com rate limiting e retries.
 
@@ -423,44 +682,89 @@ class PJeScraper:
             params: Parâmetros da query string
 
         Returns:
-            Conteúdo HTML da resposta
+            Conteúdo HTML da resposta (bytes, se em UTF-8)
 
         Raises:
             ConexaoException: Se houver erro de conexão
             CaptchaException: Se um captcha for detectado
             PaginaNaoEncontradaException: Se a página não for encontrada
         """
-        self._aplicar_rate_limit()
-
+        tentativa = 0
+        while True:
+            # Cada tentativa respeita o rate limit, como uma requisição nova
+            await self._aplicar_rate_limit_async()
+            try:
+                if self.use_aiohttp:
+                    return await self._fazer_requisicao_aiohttp(url, params)
+                return await self._fazer_requisicao_httpx_async(url, params)
+            except ConexaoException as e:
+                espera = self._espera_nova_tentativa(tentativa, e)
+                if espera is None:
+                    raise
+            await asyncio.sleep(espera)
+            tentativa += 1
+
+    async def _fazer_requisicao_httpx_async(
+        self, url: str, params: Dict[str, str]
+    ) -> Union[str, bytes]:
+        """Uma tentativa de ``_fazer_requisicao_async`` usando o cliente httpx."""
         try:
-            async with httpx.AsyncClient(
-                proxies=self.proxy, timeout=self.timeout, follow_redirects=True
-            ) as client:
-                response = await client.get(url, params=params, headers=self.headers)
-                response.raise_for_status()
+            response = await self._get_async_client().get(url, params=params)
+            # Antes do raise_for_status, que trataria o 404 como erro de conexão
+            if response.status_code == 404:
+                raise PaginaNaoEncontradaException("Página não encontrada (404)")
+            response.raise_for_status()
 
-                html_content = response.text
+            html_content = corpo_html(response.content, response.charset_encoding)
 
-                # Verificar se há captcha
-                if verificar_captcha(html_content):
-                    raise CaptchaException("Captcha detectado na página")
+            # Verificar se há captcha
+            if verificar_captcha(html_content):
+                raise CaptchaException("Captcha detectado na página")
 
-                # Verificar se é uma página 404
-                if verificar_erro_404(html_content) or response.status_code == 404:
-                    raise PaginaNaoEncontradaException("Página não encontrada (404)")
+            # Verificar se é uma página 404
+            if verificar_erro_404(html_content):
+                raise PaginaNaoEncontradaException("Página não encontrada (404)")
 
-                return html_content
+            return html_content
         except (httpx.HTTPError, httpx.TimeoutException) as e:
             logger.error(f"Erro de conexão: {str(e)}")
-            raise ConexaoException(f"Erro ao conectar ao PJe: {str(e)}")
+            status_code = (
+                e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            )
+            raise ConexaoException(f"Erro ao conectar ao PJe: {str(e)}", status_code)
 
-    @retry(
-        stop=stop_after_attempt(MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-        reraise=True,
-    )
-    def _fazer_requisicao_sync(self, url: str, params: Dict[str, str]) -> str:
+    async def _fazer_requisicao_aiohttp(
+        self, url: str, params: Dict[str, str]
+    ) -> Union[str, bytes]:
+        """Uma tentativa de ``_fazer_requisicao_async`` usando a sessão aiohttp."""
+        try:
+            async with self._get_session().get(
+                url, params=params, proxy=self.proxy
+            ) as response:
+                if response.status == 404:
+                    raise PaginaNaoEncontradaException("Página não encontrada (404)")
+                response.raise_for_status()
+                html_content = corpo_html(await response.read(), response.charset)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Erro de conexão: {str(e)}")
+            status_code = (
+                e.status if isinstance(e, aiohttp.ClientResponseError) else None
+            )
+            raise ConexaoException(f"Erro ao conectar ao PJe: {str(e)}", status_code)
+
+        # Verificar se há captcha
+        if verificar_captcha(html_content):
+            raise CaptchaException("Captcha detectado na página")
+
+        # Verificar se é uma página 404
+        if verificar_erro_404(html_content):
+            raise PaginaNaoEncontradaException("Página não encontrada (404)")
+
+        return html_content
+
+    def _fazer_requisicao_sync(
+        self, url: str, params: Dict[str, str]
+    ) -> Union[str, bytes]:
         """
         Faz uma requisição HTTP síncrona com rate limiting e retries.
 
@@ -469,90 +773,71 @@ class PJeScraper:
             params: Parâmetros da query string
 
         Returns:
-            Conteúdo HTML da resposta
+            Conteúdo HTML da resposta (bytes, se em UTF-8)
 
         Raises:
             ConexaoException: Se houver erro de conexão
             CaptchaException: Se um captcha for detectado
             PaginaNaoEncontradaException: Se a página não for encontrada
         """
-        self._aplicar_rate_limit()
-
+        tentativa = 0
+        while True:
+            self._aplicar_rate_limit_sync()
+            try:
+                return self._fazer_requisicao_httpx_sync(url, params)
+            except ConexaoException as e:
+                espera = self._espera_nova_tentativa(tentativa, e)
+                if espera is None:
+                    raise
+            time.sleep(espera)
+            tentativa += 1
+
+    def _fazer_requisicao_httpx_sync(
+        self, url: str, params: Dict[str, str]
+    ) -> Union[str, bytes]:
+        """Uma tentativa de ``_fazer_requisicao_sync``."""
         try:
-            with httpx.Client(
-                proxies=self.proxy, timeout=self.timeout, follow_redirects=True
-            ) as client:
-                response = client.get(url, params=params, headers=self.headers)
-                response.raise_for_status()
+            response = self._get_sync_client().get(url, params=params)
+            # Antes do raise_for_status, que trataria o 404 como erro de conexão
+            if response.status_code == 404:
+                raise PaginaNaoEncontradaException("Página não encontrada (404)")
+            response.raise_for_status()
 
-                html_content = response.text
+            html_content = corpo_html(response.content, response.charset_encoding)
 
-                # Verificar se há captcha
-                if verificar_captcha(html_content):
-                    raise CaptchaException("Captcha detectado na página")
+            # Verificar se há captcha
+            if verificar_captcha(html_content):
+                raise CaptchaException("Captcha detectado na página")
 
-                # Verificar se é uma página 404
-                if verificar_erro_404(html_content) or response.status_code == 404:
-                    raise PaginaNaoEncontradaException("Página não encontrada (404)")
+            # Verificar se é uma página 404
+            if verificar_erro_404(html_content):
+                raise PaginaNaoEncontradaException("Página não encontrada (404)")
 
-                return html_content
+            return html_content
         except (httpx.HTTPError, httpx.TimeoutException) as e:
             logger.error(f"Erro de conexão: {str(e)}")
-            raise ConexaoException(f"Erro ao conectar ao PJe: {str(e)}")
+            status_code = (
+                e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            )
+            raise ConexaoException(f"Erro ao conectar ao PJe: {str(e)}", status_code)
 
     def _processar_html(
-        self, html_content: str, config: ConfiguracaoBusca
+        self, html_content: Union[str, bytes], config: ConfiguracaoBusca
     ) -> ResultadoBusca:
-        """
-        Processa o HTML para extrair publicações e informações de paginação.
+        """Processa o HTML de uma página (ver ``processar_html``)."""
+        return processar_html(html_content, config)
 
-        Args:
-            html_content: Conteúdo HTML da página
-            config: Configuração da busca
-
-        Returns:
-            ResultadoBusca contendo as publicações encontradas e metadados
-
-        Raises:
-            ParsingException: Se houver erro no parsing do HTML
+    async def _processar_html_async(
+        self, html_content: Union[str, bytes], config: ConfiguracaoBusca
+    ) -> ResultadoBusca:
         """
-        try:
-            parser = HTMLParser(html_content)
-
-            # Extrair informações de paginação
-            total_encontrado, pagina_atual, total_paginas = (
-                extrair_informacoes_paginacao(parser)
-            )
-
-            # Buscar elementos de publicação
-            # Nota: O seletor CSS exato depende da estrutura do site
-            elementos_publicacao = parser.css("div.publicacao")
-            if not elementos_publicacao:
-                elementos_publicacao = parser.css("div.resultado-item")
-
-            if not elementos_publicacao:
-                logger.warning("Nenhum elemento de publicação encontrado no HTML")
-
-            # Extrair dados de cada publicação
-            publicacoes = []
-            for elem in elementos_publicacao:
-                dados = extrair_dados_publicacao(elem)
-                if dados:
-                    try:
-                        publicacoes.append(Publicacao(**dados))
-                    except Exception as e:
-                        logger.error(f"Erro ao criar objeto Publicacao: {str(e)}")
-
-            return ResultadoBusca(
-                publicacoes=publicacoes,
-                total_encontrado=total_encontrado,
-                pagina_atual=pagina_atual,
-                total_paginas=total_paginas,
-                parametros_busca=config.dict(),
-            )
-        except Exception as e:
-            logger.error(f"Erro ao processar HTML: {str(e)}")
-            raise ParsingException(f"Erro ao processar HTML: {str(e)}")
+        Processa o HTML fora do event loop, no ``parse_executor`` do scraper
+        (ou no executor padrão de threads, se não informado).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.parse_executor, processar_html, html_content, config
+        )
 
     async def buscar_publicacoes_async(
         self, config: ConfiguracaoBusca
@@ -569,7 +854,7 @@ class PJeScraper:
         try:
             params = config.para_parametros_url()
             html_content = await self._fazer_requisicao_async(BASE_URL, params)
-            return self._processar_html(html_content, config)
+            return await self._processar_html_async(html_content, config)
         except PJeScraperException as e:
             logger.error(f"Erro na busca de publicações: {str(e)}")
             return ResultadoBusca(
@@ -615,20 +900,76 @@ class PJeScraper:
         if resultado.erro or resultado.total_paginas <= 1:
             return resultado
 
-        # Buscar páginas restantes em paralelo
-        tarefas = []
-        for pagina in range(2, resultado.total_paginas + 1):
-            config_pagina = ConfiguracaoBusca(**config.dict())
-            config_pagina.pagina = pagina
-            tarefas.append(self.buscar_publicacoes_async(config_pagina))
-
-        # Aguardar todas as tarefas e combinar resultados
-        resultados_adicionais = await asyncio.gather(*tarefas)
-
-        # Combinar publicações de todas as páginas
+        # Páginas restantes em pipeline: o download (I/O) acontece em paralelo,
+        # limitado pelo semáforo, enquanto o parsing (CPU) roda no executor à
+        # medida que as páginas chegam. A fila e o limite de parsings em
+        # andamento limitam quantos HTMLs baixados ficam em memória.
+        semaforo = asyncio.Semaphore(self.max_concurrency)
+        fila: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+        # As páginas só diferem no parâmetro "pagina"
+        base_params = config.para_parametros_url()
+
+        async def buscar_pagina(pagina):
+            # A vaga do semáforo só é liberada após enfileirar o HTML, para que
+            # um consumidor lento também segure novos downloads. Toda página
+            # enfileira exatamente um item: o HTML, None (erro já registrado)
+            # ou a exceção inesperada, repassada ao consumidor.
+            async with semaforo:
+                try:
+                    html_content = await self._fazer_requisicao_async(
+                        BASE_URL, {**base_params, "pagina": str(pagina)}
+                    )
+                except PJeScraperException as e:
+                    logger.error(f"Erro na busca da página {pagina}: {str(e)}")
+                    html_content = None
+                except Exception as e:
+                    html_content = e
+                await fila.put((pagina, html_content))
+
+        # Até max_concurrency páginas são processadas ao mesmo tempo
+        limite_parsing = asyncio.Semaphore(self.max_concurrency)
+        publicacoes_por_pagina = {}
+
+        async def processar_pagina(pagina, html_content):
+            try:
+                res = await self._processar_html_async(html_content, config)
+                publicacoes_por_pagina[pagina] = res.publicacoes
+            except ParsingException:
+                pass
+            finally:
+                limite_parsing.release()
+
+        paginas = range(2, resultado.total_paginas + 1)
+        produtor = asyncio.gather(*(buscar_pagina(p) for p in paginas))
+        processamentos = []
+        try:
+            for _ in paginas:
+                await limite_parsing.acquire()
+                pagina, html_content = await fila.get()
+                if html_content is None or isinstance(html_content, Exception):
+                    limite_parsing.release()
+                    if html_content is None:
+                        continue
+                    raise html_content
+                processamentos.append(
+                    asyncio.create_task(processar_pagina(pagina, html_content))
+                )
+            await asyncio.gather(*processamentos)
+        finally:
+            produtor.cancel()
+            for tarefa in processamentos:
+                tarefa.cancel()
+
+        # Combinar publicações de todas as páginas, na ordem das páginas,
+        # descartando as repetidas na fronteira entre páginas
         todas_publicacoes = resultado.publicacoes.copy()
-        for res in resultados_adicionais:
-            todas_publicacoes.extend(res.publicacoes)
+        vistas = {pub.hash for pub in todas_publicacoes}
+        for pagina in sorted(publicacoes_por_pagina):
+            for pub in publicacoes_por_pagina[pagina]:
+                if pub.hash not in vistas:
+                    vistas.add(pub.hash)
+                    todas_publicacoes.append(pub)
 
         # Atualizar resultado com todas as publicações
         resultado.publicacoes = todas_publicacoes
@@ -653,14 +994,24 @@ class PJeScraper:
         if resultado.erro or resultado.total_paginas <= 1:
             return resultado
 
-        # Buscar páginas restantes sequencialmente
+        # Buscar páginas restantes sequencialmente, descartando publicações
+        # repetidas na fronteira entre páginas
         todas_publicacoes = resultado.publicacoes.copy()
+        vistas = {pub.hash for pub in todas_publicacoes}
+        base_params = config.para_parametros_url()
         for pagina in range(2, resultado.total_paginas + 1):
-            config_pagina = ConfiguracaoBusca(**config.dict())
-            config_pagina.pagina = pagina
-            res = self.buscar_publicacoes(config_pagina)
-            if not res.erro:
-                todas_publicacoes.extend(res.publicacoes)
+            try:
+                html_content = self._fazer_requisicao_sync(
+                    BASE_URL, {**base_params, "pagina": str(pagina)}
+                )
+                res = self._processar_html(html_content, config)
+            except PJeScraperException as e:
+                logger.error(f"Erro na busca da página {pagina}: {str(e)}")
+                continue
+            for pub in res.publicacoes:
+                if pub.hash not in vistas:
+                    vistas.add(pub.hash)
+                    todas_publicacoes.append(pub)
 
         # Atualizar resultado com todas as publicações
         resultado.publicacoes = todas_publicacoes
@@ -778,28 +1129,19 @@ class PJeScraper:
             resultado: Resultado da busca
             caminho: Caminho do arquivo para salvar
         """
-
-        class DateTimeEncoder(json.JSONEncoder):
-            def default(self, obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                return super().default(obj)
-
-        with open(caminho, "w", encoding="utf-8") as f:
-            json.dump(
-                resultado.dict(), f, cls=DateTimeEncoder, ensure_ascii=False, indent=2
-            )
+        # orjson serializa datetime nativamente (ISO 8601) e gera UTF-8 direto
+        with open(caminho, "wb") as f:
+            f.write(orjson.dumps(resultado.dict(), option=orjson.OPT_INDENT_2))
 
         logger.info(f"Resultado salvo em {caminho}")
 
 
-# Função para uso em linha de comando
-async def main_async():
-    """Função principal para execução assíncrona via linha de comando."""
+# Funções para uso em linha de comando
+def _criar_parser_argumentos():
     import argparse
 
     parser = argparse.ArgumentParser(description="Scraper de publicações do PJe")
-    parser.add_argument("--oab", required=True, help="Número da OAB")
+    parser.add_argument("--oab", required=True, nargs="+", help="Número(s) da OAB")
     parser.add_argument("--uf", required=True, help="UF da OAB")
     parser.add_argument(
         "--dias", type=int, default=7, help="Número de dias para buscar"
@@ -808,55 +1150,64 @@ async def main_async():
         "--saida", default="publicacoes.json", help="Arquivo de saída JSON"
     )
     parser.add_argument("--proxy", help="URL do proxy (opcional)")
+    parser.add_argument(
+        "--async", dest="async_mode", action="store_true", help="Usar modo assíncrono"
+    )
+    return parser
 
-    args = parser.parse_args()
 
-    scraper = PJeScraper(proxy=args.proxy)
+def _caminho_saida(saida: str, numero_oab: str, total_oabs: int) -> str:
+    """Com várias OABs, cada uma ganha seu arquivo: publicacoes_<oab>.json."""
+    if total_oabs == 1:
+        return saida
+    base, extensao = os.path.splitext(saida)
+    return f"{base}_{numero_oab}{extensao}"
 
-    print(
-        f"Buscando publicações para OAB {args.oab}/{args.uf} nos últimos {args.dias} dias..."
-    )
-    resultado = await scraper.buscar_ultimos_dias_async(args.oab, args.uf, args.dias)
 
-    print(f"Encontradas {len(resultado.publicacoes)} publicações")
-    scraper.salvar_resultado_json(resultado, args.saida)
-    print(f"Resultado salvo em {args.saida}")
+async def main_async(args=None):
+    """
+    Função principal para execução assíncrona via linha de comando.
 
+    Todas as OABs informadas são buscadas com o mesmo scraper, reaproveitando
+    o cliente HTTP (conexões e sessões TLS) entre as buscas.
+    """
+    if args is None:
+        args = _criar_parser_argumentos().parse_args()
 
-def main():
-    """Função principal para execução síncrona via linha de comando."""
-    import argparse
+    async with PJeScraper(proxy=args.proxy) as scraper:
+        for numero_oab in args.oab:
+            print(
+                f"Buscando publicações para OAB {numero_oab}/{args.uf} nos últimos {args.dias} dias..."
+            )
+            resultado = await scraper.buscar_ultimos_dias_async(
+                numero_oab, args.uf, args.dias
+            )
+
+            print(f"Encontradas {len(resultado.publicacoes)} publicações")
+            caminho = _caminho_saida(args.saida, numero_oab, len(args.oab))
+            scraper.salvar_resultado_json(resultado, caminho)
+            print(f"Resultado salvo em {caminho}")
 
-    parser = argparse.ArgumentParser(description="Scraper de publicações do PJe")
-    parser.add_argument("--oab", required=True, help="Número da OAB")
-    parser.add_argument("--uf", required=True, help="UF da OAB")
-    parser.add_argument(
-        "--dias", type=int, default=7, help="Número de dias para buscar"
-    )
-    parser.add_argument(
-        "--saida", default="publicacoes.json", help="Arquivo de saída JSON"
-    )
-    parser.add_argument("--proxy", help="URL do proxy (opcional)")
-    parser.add_argument(
-        "--async", dest="async_mode", action="store_true", help="Usar modo assíncrono"
-    )
 
-    args = parser.parse_args()
+def main():
+    """Função principal para execução síncrona via linha de comando."""
+    args = _criar_parser_argumentos().parse_args()
 
     if args.async_mode:
-        asyncio.run(main_async())
+        asyncio.run(main_async(args))
         return
 
-    scraper = PJeScraper(proxy=args.proxy)
-
-    print(
-        f"Buscando publicações para OAB {args.oab}/{args.uf} nos últimos {args.dias} dias..."
-    )
-    resultado = scraper.buscar_ultimos_dias(args.oab, args.uf, args.dias)
+    with PJeScraper(proxy=args.proxy) as scraper:
+        for numero_oab in args.oab:
+            print(
+                f"Buscando publicações para OAB {numero_oab}/{args.uf} nos últimos {args.dias} dias..."
+            )
+            resultado = scraper.buscar_ultimos_dias(numero_oab, args.uf, args.dias)
 
-    print(f"Encontradas {len(resultado.publicacoes)} publicações")
-    scraper.salvar_resultado_json(resultado, args.saida)
-    print(f"Resultado salvo em {args.saida}")
+            print(f"Encontradas {len(resultado.publicacoes)} publicações")
+            caminho = _caminho_saida(args.saida, numero_oab, len(args.oab))
+            scraper.salvar_resultado_json(resultado, caminho)
+            print(f"Resultado salvo em {caminho}")
 
 
 if __name__ == "__main__":
@@ -7,16 +7,33 @@ com suporte a múltiplos signatários.
 """
 
 import os
+import asyncio
 import hashlib
+import hmac
+import itertools
 import json
+import mmap
+import secrets
+import stat
+import tempfile
+import threading
 import time
 import uuid
 import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timedelta
+from email.utils import formatdate
+from collections import OrderedDict
 from enum import Enum
-from typing import Dict, List, Optional, Union, Any
+from functools import lru_cache
+from urllib.parse import quote
+from typing import Dict, List, Optional, Union, Any, Awaitable, Callable, NamedTuple, Tuple
 
 import httpx
+import orjson
+from eth_account import Account
 from fastapi import (
     FastAPI,
     HTTPException,
@@ -27,20 +44,27 @@ from fastapi import (
     Form,
     Query,
 )
-from fastapi.responses import JSONResponse, FileResponse
-from pydantic import BaseModel, Field, EmailStr, validator
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from sqlalchemy import (
+    BigInteger,
     Column,
     String,
     Integer,
     DateTime,
     ForeignKey,
     Boolean,
+    Index,
     Text,
     JSON,
+    UniqueConstraint,
+    insert,
 )
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, Session
+from sqlalchemy.orm import load_only, relationship, Session
+from starlette.background import BackgroundTask
 from starlette.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 from jose import jwt
 
@@ -51,6 +75,9 @@ logger = logging.getLogger(__name__)
 # Base para modelos SQLAlchemy
 Base = declarative_base()
 
+# Colunas JSON usam JSONB (binário) no PostgreSQL e JSON nos demais bancos
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 # Configurações
 class Settings:
@@ -69,6 +96,32 @@ class Settings:
         "DOCUMENT_STORAGE_PATH", "/tmp/prudentia/documents"
     )
     TOKEN_EXPIRY = int(os.getenv("TOKEN_EXPIRY", "86400"))  # 24 horas em segundos
+    # Consultar o nó da blockchain via JSON-RPC em vez de simular as respostas
+    BLOCKCHAIN_RPC_ENABLED = os.getenv("BLOCKCHAIN_RPC_ENABLED", "False") == "True"
+    BLOCKCHAIN_RPC_MAX_BATCH = int(os.getenv("BLOCKCHAIN_RPC_MAX_BATCH", "64"))
+    BLOCKCHAIN_RPC_BATCH_WINDOW = float(
+        os.getenv("BLOCKCHAIN_RPC_BATCH_WINDOW", "0.005")
+    )  # segundos
+    # Tempo máximo de espera pela resposta de uma chamada JSON-RPC em lote
+    BLOCKCHAIN_RPC_TIMEOUT = float(os.getenv("BLOCKCHAIN_RPC_TIMEOUT", "30"))
+    # Tempo máximo de espera pela mineração da transação de registro
+    BLOCKCHAIN_RECEIPT_TIMEOUT = float(os.getenv("BLOCKCHAIN_RECEIPT_TIMEOUT", "120"))
+    # Registro em lote: documentos concluídos são agrupados em uma árvore de Merkle
+    MERKLE_BATCH_SIZE = int(os.getenv("MERKLE_BATCH_SIZE", "32"))
+    MERKLE_BATCH_INTERVAL = float(os.getenv("MERKLE_BATCH_INTERVAL", "2.0"))  # segundos
+    # Tempo máximo de espera pelo registro de um documento submetido ao lote
+    MERKLE_SUBMIT_TIMEOUT = float(os.getenv("MERKLE_SUBMIT_TIMEOUT", "180"))
+    # Intervalo da varredura que registra documentos concluídos ainda sem transação
+    BLOCKCHAIN_ANCHOR_SWEEP_INTERVAL = float(
+        os.getenv("BLOCKCHAIN_ANCHOR_SWEEP_INTERVAL", "60")
+    )  # segundos
+    BLOCKCHAIN_ANCHOR_SWEEP_LIMIT = int(os.getenv("BLOCKCHAIN_ANCHOR_SWEEP_LIMIT", "256"))
+    # Prefixo interno do proxy reverso para downloads via X-Accel-Redirect (vazio
+    # desativa). Ex. nginx, com DOCUMENT_ACCEL_REDIRECT_PREFIX=/_protected/:
+    #   location /_protected/ { internal; alias <DOCUMENT_STORAGE_PATH>/; sendfile on; tcp_nopush on; }
+    DOCUMENT_ACCEL_REDIRECT_PREFIX = os.getenv("DOCUMENT_ACCEL_REDIRECT_PREFIX", "")
+    # Limite de documentos por requisição de download em lote (IN e ZIP)
+    BATCH_DOWNLOAD_MAX_DOCUMENTS = int(os.getenv("BATCH_DOWNLOAD_MAX_DOCUMENTS", "100"))
 
     # Garantir que o diretório de armazenamento exista
     @classmethod
@@ -114,10 +167,19 @@ class Document(Base):
     file_path = Column(String(255), nullable=False)  # Caminho para o arquivo no sistema
     file_hash = Column(String(64), nullable=False)  # Hash SHA-256 do arquivo original
     file_size = Column(Integer, nullable=False)  # Tamanho do arquivo em bytes
+    # Colunas acrescentadas depois da criação da tabela (sem Alembic). Bancos
+    # existentes precisam de:
+    #   ALTER TABLE documents ADD COLUMN file_mtime_ns BIGINT;
+    #   ALTER TABLE documents ADD COLUMN merkle_root VARCHAR(64);
+    #   ALTER TABLE documents ADD COLUMN merkle_proof JSONB;
+    file_mtime_ns = Column(BigInteger, nullable=True)  # mtime do arquivo (ns), gravado no upload
     file_type = Column(String(100), nullable=False)  # Tipo MIME do arquivo
     blockchain_tx = Column(String(66), nullable=True)  # Hash da transação blockchain
     blockchain_block = Column(Integer, nullable=True)  # Número do bloco na blockchain
-    metadata = Column(JSON, nullable=True)  # Metadados adicionais
+    merkle_root = Column(String(64), nullable=True)  # Raiz do lote registrado
+    merkle_proof = Column(JSONType, nullable=True)  # Prova de inclusão na árvore do lote
+    # "metadata" é reservado pelo declarative do SQLAlchemy; a coluna mantém o nome
+    metadata_ = Column("metadata", JSONType, nullable=True)  # Metadados adicionais
 
     # Relacionamentos
     signatures = relationship(
@@ -127,6 +189,12 @@ class Document(Base):
 
 class Signature(Base):
     __tablename__ = "signatures"
+    __table_args__ = (
+        # Um mesmo email não pode ser signatário duas vezes do mesmo documento
+        UniqueConstraint("document_id", "signer_email", name="uq_sig_doc_email"),
+        # Contagem de pendentes e listagem de assinadas filtram por (documento, status)
+        Index("ix_sig_doc_status", "document_id", "status"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     document_id = Column(String(36), ForeignKey("documents.id"), nullable=False)
@@ -176,8 +244,7 @@ class SignatureResponse(SignatureBase):
     signature_date: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DocumentBase(BaseModel):
@@ -206,8 +273,7 @@ class DocumentResponse(DocumentBase):
     blockchain_block: Optional[int] = None
     signatures: List[SignatureResponse]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SignatureVerification(BaseModel):
@@ -228,6 +294,285 @@ class BlockchainRegistration(BaseModel):
     signers: List[str]
 
 
+# Cliente JSON-RPC com agrupamento de chamadas
+class BatchingBlockchainClient:
+    """
+    Cliente JSON-RPC que agrupa chamadas concorrentes em uma única requisição.
+
+    Chamadas que chegam dentro de uma janela curta são enviadas ao nó como um
+    lote JSON-RPC 2.0 (um único POST contendo uma lista de chamadas), e cada
+    chamador recebe o resultado correspondente ao seu ``id``.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_batch_size: int = 64,
+        batch_window: float = 0.005,
+        timeout: float = 30.0,
+    ):
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def call(self, method: str, params: List[Any]) -> Any:
+        """
+        Submete uma chamada JSON-RPC e aguarda o seu resultado.
+
+        Args:
+            method: Nome do método JSON-RPC (ex: ``eth_getTransactionReceipt``)
+            params: Parâmetros posicionais do método
+
+        Returns:
+            Any: Campo ``result`` da resposta
+
+        Raises:
+            ValueError: Se o nó retornar um erro ou não responder à chamada
+            asyncio.TimeoutError: Se a resposta não chegar em ``timeout`` segundos
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": method,
+            "params": params,
+        }
+        await self._queue.put((payload, future))
+        return await asyncio.wait_for(future, self.timeout)
+
+    async def _run(self):
+        """Drena a fila em lotes de até ``max_batch_size`` chamadas."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._send_batch(batch)
+            except Exception as e:
+                # Nunca deixa o worker morrer com chamadores aguardando
+                logger.error(f"Error processing JSON-RPC batch: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _send_batch(self, batch: List[Any]):
+        """Envia um lote ao nó e resolve os futures de cada chamada."""
+        futures = {payload["id"]: future for payload, future in batch}
+        try:
+            response = await self.client.post(
+                "", json=[payload for payload, _ in batch]
+            )
+            response.raise_for_status()
+            replies = response.json()
+
+            # Alguns nós respondem com um único objeto de erro para o lote inteiro
+            if isinstance(replies, dict):
+                replies = [replies]
+
+            for reply in replies:
+                if not isinstance(reply, dict):
+                    continue
+                future = futures.pop(reply.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in reply:
+                    future.set_exception(ValueError(f"JSON-RPC error: {reply['error']}"))
+                else:
+                    future.set_result(reply.get("result"))
+        except Exception as e:
+            logger.error(f"Error sending JSON-RPC batch: {str(e)}")
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(ValueError(f"JSON-RPC batch failed: {str(e)}"))
+            return
+
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(ValueError("Missing JSON-RPC response"))
+
+    async def aclose(self):
+        """Encerra o processamento de lotes."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+# Árvore de Merkle para registro de documentos em lote
+def build_merkle_tree(leaves: List[str]) -> Tuple[str, Dict[str, List[List[str]]]]:
+    """
+    Constrói uma árvore de Merkle (SHA-256) sobre hashes de documentos.
+
+    As folhas são ordenadas e deduplicadas. Um nó sem par em um nível é
+    promovido sem alteração para o nível seguinte.
+
+    Args:
+        leaves: Hashes SHA-256 (hexadecimal) dos documentos
+
+    Returns:
+        Tuple: Raiz da árvore e, para cada folha, sua prova de inclusão como
+        lista de pares ``[hash_irmão, lado]`` (lado ``"L"`` ou ``"R"``)
+    """
+    level = [bytes.fromhex(leaf) for leaf in sorted(set(leaves))]
+    positions = {leaf.hex(): [i] for i, leaf in enumerate(level)}
+    proofs: Dict[str, List[List[str]]] = {leaf: [] for leaf in positions}
+
+    while len(level) > 1:
+        for leaf, pos in positions.items():
+            index = pos[0]
+            sibling = index ^ 1
+            if sibling < len(level):
+                side = "R" if sibling > index else "L"
+                proofs[leaf].append([level[sibling].hex(), side])
+            pos[0] = index // 2
+
+        level = [
+            (
+                hashlib.sha256(level[i] + level[i + 1]).digest()
+                if i + 1 < len(level)
+                else level[i]
+            )
+            for i in range(0, len(level), 2)
+        ]
+
+    return level[0].hex(), proofs
+
+
+def compute_merkle_root(leaf: str, proof: List[List[str]]) -> str:
+    """Recalcula a raiz de Merkle a partir de uma folha e de sua prova de inclusão."""
+    node = bytes.fromhex(leaf)
+    for sibling, side in proof:
+        sibling = bytes.fromhex(sibling)
+        node = hashlib.sha256(node + sibling if side == "R" else sibling + node).digest()
+    return node.hex()
+
+
+class MerkleBatcher:
+    """
+    Agrupa registros de documentos em uma única transação na blockchain.
+
+    Os hashes submetidos são acumulados até ``max_batch_size`` documentos ou
+    ``flush_interval`` segundos; apenas a raiz da árvore de Merkle do lote é
+    registrada, e cada chamador recebe a transação e a sua prova de inclusão.
+    """
+
+    def __init__(
+        self,
+        register: Callable[[str, List[str]], Awaitable[Dict[str, Any]]],
+        max_batch_size: int = 32,
+        flush_interval: float = 2.0,
+        timeout: float = 180.0,
+    ):
+        self.register = register
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, document_hash: str, signers: List[str]) -> Dict[str, Any]:
+        """
+        Submete um documento ao próximo lote e aguarda o seu registro.
+
+        Args:
+            document_hash: Hash SHA-256 do documento
+            signers: Emails dos signatários do documento
+
+        Returns:
+            Dict: Dados da transação, raiz do lote e prova de inclusão
+
+        Raises:
+            asyncio.TimeoutError: Se o lote não for registrado em ``timeout`` segundos
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((document_hash, signers, future))
+        return await asyncio.wait_for(future, self.timeout)
+
+    async def _run(self):
+        """Acumula documentos e registra um lote por vez."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                # Nunca deixa o worker morrer com chamadores aguardando
+                logger.error(f"Error processing Merkle batch: {str(e)}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _flush(self, batch: List[Any]):
+        """Registra a raiz do lote e resolve os futures de cada documento."""
+        try:
+            root, proofs = build_merkle_tree(
+                [document_hash for document_hash, _, _ in batch]
+            )
+            signers = sorted({email for _, emails, _ in batch for email in emails})
+            result = await self.register(root, signers)
+        except Exception as e:
+            logger.error(f"Error registering Merkle batch: {str(e)}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.info(f"Merkle root {root} registered for {len(batch)} documents")
+        for document_hash, _, future in batch:
+            if not future.done():
+                future.set_result(
+                    {
+                        **result,
+                        "merkle_root": root,
+                        "merkle_proof": proofs[document_hash],
+                    }
+                )
+
+    async def aclose(self):
+        """Encerra o processamento de lotes."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
 # Classe para interação com blockchain
 class BlockchainService:
     """Serviço para interação com a blockchain para registro e verificação de assinaturas."""
@@ -237,6 +582,26 @@ class BlockchainService:
         self.contract_address = settings.BLOCKCHAIN_CONTRACT_ADDRESS
         self.private_key = settings.BLOCKCHAIN_PRIVATE_KEY
         self.network = settings.BLOCKCHAIN_NETWORK
+        # Cliente HTTP de longa duração: reaproveita conexões TCP/TLS entre
+        # chamadas e multiplexa requisições via HTTP/2
+        self._client = httpx.AsyncClient(
+            base_url=self.api_url,
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+        self.rpc = BatchingBlockchainClient(
+            self._client,
+            max_batch_size=settings.BLOCKCHAIN_RPC_MAX_BATCH,
+            batch_window=settings.BLOCKCHAIN_RPC_BATCH_WINDOW,
+            timeout=settings.BLOCKCHAIN_RPC_TIMEOUT,
+        )
+        self.merkle = MerkleBatcher(
+            self.register_document,
+            max_batch_size=settings.MERKLE_BATCH_SIZE,
+            flush_interval=settings.MERKLE_BATCH_INTERVAL,
+            timeout=settings.MERKLE_SUBMIT_TIMEOUT,
+        )
 
     async def register_document(
         self, document_hash: str, signers: List[str]
@@ -244,9 +609,19 @@ class BlockchainService:
         """
         Registra o hash de um documento na blockchain.
 
-        Em produção, isso chamaria um smart contract em Ethereum ou Hyperledger.
-        Para simplificar, simulamos o registro com um timestamp.
+        Com ``BLOCKCHAIN_RPC_ENABLED``, envia ao contrato de registro uma transação
+        assinada cujo calldata é o hash (32 bytes) e aguarda a sua mineração.
+        Caso contrário, simula o registro com um timestamp.
         """
+        if settings.BLOCKCHAIN_RPC_ENABLED:
+            try:
+                return await self._register_document_rpc(document_hash)
+            except Exception as e:
+                logger.error(f"Error registering document on blockchain: {str(e)}")
+                raise ValueError(
+                    f"Failed to register document on blockchain: {str(e)}"
+                )
+
         try:
             timestamp = int(time.time())
 
@@ -269,14 +644,114 @@ class BlockchainService:
             logger.error(f"Error registering document on blockchain: {str(e)}")
             raise ValueError(f"Failed to register document on blockchain: {str(e)}")
 
+    async def _register_document_rpc(self, document_hash: str) -> Dict[str, Any]:
+        """Envia a transação de registro via JSON-RPC e aguarda o recibo."""
+        account = Account.from_key(self.private_key)
+        data = f"0x{document_hash}"
+
+        # Disparadas juntas, as consultas seguem em um único lote JSON-RPC
+        chain_id, nonce, gas_price, gas = await asyncio.gather(
+            self.rpc.call("eth_chainId", []),
+            self.rpc.call("eth_getTransactionCount", [account.address, "pending"]),
+            self.rpc.call("eth_gasPrice", []),
+            self.rpc.call(
+                "eth_estimateGas",
+                [{"from": account.address, "to": self.contract_address, "data": data}],
+            ),
+        )
+        signed = account.sign_transaction(
+            {
+                "chainId": int(chain_id, 16),
+                "nonce": int(nonce, 16),
+                "gasPrice": int(gas_price, 16),
+                "gas": int(gas, 16),
+                "to": self.contract_address,
+                "value": 0,
+                "data": data,
+            }
+        )
+        tx_hash = await self.rpc.call(
+            "eth_sendRawTransaction", [signed.rawTransaction.hex()]
+        )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.BLOCKCHAIN_RECEIPT_TIMEOUT
+        receipt = None
+        while receipt is None:
+            if loop.time() >= deadline:
+                raise TimeoutError(f"Transaction {tx_hash} not mined in time")
+            await asyncio.sleep(1.0)
+            receipt = await self.rpc.call("eth_getTransactionReceipt", [tx_hash])
+
+        if receipt.get("status") != "0x1":
+            raise ValueError(f"Transaction {tx_hash} reverted")
+
+        logger.info(
+            f"Document hash {document_hash} registered on blockchain with tx {tx_hash}"
+        )
+        return {
+            "tx_hash": tx_hash,
+            "block_number": int(receipt["blockNumber"], 16),
+            "timestamp": int(time.time()),
+            "status": "confirmed",
+        }
+
+    async def aclose(self):
+        """Encerra os lotes pendentes e fecha as conexões com o nó da blockchain."""
+        await self.merkle.aclose()
+        await self.rpc.aclose()
+        await self._client.aclose()
+
+    async def register_document_batched(
+        self, document_hash: str, signers: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Registra o hash de um documento como folha do próximo lote de Merkle.
+
+        Retorna os mesmos dados de ``register_document`` para a raiz do lote,
+        acrescidos de ``merkle_root`` e ``merkle_proof``.
+        """
+        return await self.merkle.submit(document_hash, signers)
+
     async def verify_document(self, document_hash: str, tx_hash: str) -> Dict[str, Any]:
         """
         Verifica se um hash de documento está registrado na blockchain.
 
-        Em produção, isso consultaria o smart contract para verificar o registro.
+        Com ``BLOCKCHAIN_RPC_ENABLED``, confere na blockchain que ``tx_hash`` é uma
+        transação bem-sucedida ao contrato de registro cujo calldata é
+        ``document_hash`` (ou a raiz de Merkle do lote). Caso contrário, simula.
         """
         try:
-            # Em um ambiente de produção, aqui seria feita a consulta real à blockchain
+            if settings.BLOCKCHAIN_RPC_ENABLED:
+                # Transação e recibo em um único lote JSON-RPC. A transação só
+                # prova o registro se foi bem-sucedida, se destina ao contrato de
+                # registro e carrega exatamente este hash como calldata.
+                transaction, receipt = await asyncio.gather(
+                    self.rpc.call("eth_getTransactionByHash", [tx_hash]),
+                    self.rpc.call("eth_getTransactionReceipt", [tx_hash]),
+                )
+                is_valid = (
+                    bool(transaction)
+                    and bool(receipt)
+                    and receipt.get("status") == "0x1"
+                    and (transaction.get("to") or "").lower()
+                    == self.contract_address.lower()
+                    and hmac.compare_digest(
+                        (transaction.get("input") or "").lower(),
+                        f"0x{document_hash}".lower(),
+                    )
+                )
+
+                return {
+                    "valid": is_valid,
+                    "document_hash": document_hash,
+                    "tx_hash": tx_hash,
+                    "block_number": (
+                        int(receipt["blockNumber"], 16) if receipt else None
+                    ),
+                    "status": "confirmed" if is_valid else "not_found",
+                }
+
             # Simulação de verificação para desenvolvimento
             # Em produção, verificaríamos o evento emitido pelo smart contract
 
@@ -297,19 +772,65 @@ class BlockchainService:
 
 
 # Funções de utilidade
-def calculate_file_hash(file_path: str) -> str:
-    """Calcula o hash SHA-256 de um arquivo."""
+# Acima deste tamanho o arquivo é mapeado em memória e hasheado de uma só vez
+MMAP_HASH_THRESHOLD = 4 * 1024 * 1024  # 4 MB
+
+
+def _calculate_file_digest(file_path: str) -> bytes:
+    """Calcula o digest SHA-256 (32 bytes) de um arquivo."""
     sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_HASH_THRESHOLD:
+            # Arquivos grandes: uma única chamada ao OpenSSL sobre o mapeamento,
+            # com o kernel fazendo a leitura antecipada das páginas
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                sha256_hash.update(mm)
+            return sha256_hash.digest()
+
         # Lê o arquivo em chunks para lidar com arquivos grandes
         for byte_block in iter(lambda: f.read(4096), b""):
             sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+    return sha256_hash.digest()
+
+
+def calculate_file_hash(file_path: str) -> str:
+    """Calcula o hash SHA-256 de um arquivo."""
+    return _calculate_file_digest(file_path).hex()
+
+
+def _write_file(file_path: str, content: bytes) -> None:
+    """Grava o conteúdo de um arquivo em disco."""
+    with open(file_path, "wb") as f:
+        f.write(content)
+
+
+def _build_zip_archive(entries: List[Tuple[str, str]]) -> str:
+    """
+    Grava um arquivo ZIP temporário com os arquivos informados.
+
+    Args:
+        entries: Pares (caminho no disco, nome dentro do ZIP)
+
+    Returns:
+        str: Caminho do arquivo ZIP criado (cabe ao chamador removê-lo)
+    """
+    fd, archive_path = tempfile.mkstemp(suffix=".zip")
+    try:
+        # PDFs já são comprimidos; ZIP_STORED evita gastar CPU recomprimindo
+        with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as zf:
+            for file_path, arcname in entries:
+                zf.write(file_path, arcname)
+    except BaseException:
+        os.remove(archive_path)
+        raise
+    return archive_path
 
 
 def generate_signature_token() -> str:
-    """Gera um token único para assinatura."""
-    return hashlib.sha256(f"{uuid.uuid4()}{time.time()}".encode()).hexdigest()
+    """Gera um token único para assinatura (256 bits aleatórios em hexadecimal)."""
+    return secrets.token_hex(32)
 
 
 def create_signature_jwt(signature_id: str, document_id: str) -> str:
@@ -331,6 +852,402 @@ def verify_signature_jwt(token: str) -> Dict[str, Any]:
         )
 
 
+# Resposta de download de PDFs
+# Tamanho de cada leitura no envio em chunks. Cada chunk é um objeto bytes novo:
+# servidores ASGI podem manter referência ao corpo após ``send`` retornar (ex:
+# buffers de escrita do transporte asyncio), então reutilizar um pool de buffers
+# fixos poderia corromper respostas em trânsito. O caminho zero-copy, quando
+# disponível, já dispensa buffers em espaço de usuário.
+PDF_CHUNK_SIZE = 256 * 1024  # 256 KB
+
+# Pool dedicado às leituras de downloads, para que não disputem o executor
+# padrão com o cálculo de hashes de arquivos grandes
+_FILE_IO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pdf-io")
+
+# Cabeçalhos fixos de toda resposta de PDF, já codificados
+_PDF_STATIC_HEADERS = (
+    (b"content-type", b"application/pdf"),
+    (b"accept-ranges", b"bytes"),
+)
+
+
+@lru_cache(maxsize=4096)
+def _stat_header_values(file_size: int, mtime: float) -> Tuple[bytes, bytes, bytes]:
+    """Content-Length, Last-Modified e ETag codificados para um par tamanho/mtime."""
+    # Mesmo formato de ETag do FileResponse do Starlette
+    etag_base = f"{mtime}-{file_size}".encode()
+    etag = hashlib.md5(etag_base, usedforsecurity=False).hexdigest()
+    return (
+        str(file_size).encode("latin-1"),
+        formatdate(mtime, usegmt=True).encode("latin-1"),
+        f'"{etag}"'.encode("latin-1"),
+    )
+
+
+def parse_byte_range(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interpreta um cabeçalho ``Range`` de intervalo único.
+
+    Args:
+        range_header: Valor do cabeçalho (ex: ``bytes=0-1023``, ``bytes=-500``)
+        file_size: Tamanho do arquivo em bytes
+
+    Returns:
+        Optional[Tuple[int, int]]: (início, fim) inclusivos, ou None se o
+        cabeçalho deve ser ignorado (formato inválido ou múltiplos intervalos)
+
+    Raises:
+        ValueError: Se o intervalo não puder ser satisfeito (resposta 416)
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    start_text, sep, end_text = ranges.strip().partition("-")
+    if not sep:
+        return None
+    start_text, end_text = start_text.strip(), end_text.strip()
+    if not (start_text.isdigit() or start_text == "") or not (
+        end_text.isdigit() or end_text == ""
+    ):
+        return None
+
+    if start_text == "":
+        # Sufixo: os últimos N bytes
+        if end_text == "":
+            return None
+        suffix_length = int(end_text)
+        if suffix_length == 0 or file_size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(file_size - suffix_length, 0), file_size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else file_size - 1
+    if end_text and end < start:
+        return None
+    if start >= file_size:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, file_size - 1)
+
+
+class PDFFileResponse(FileResponse):
+    """
+    Resposta de arquivo que usa envio zero-copy quando o servidor ASGI suporta.
+
+    Se o servidor anunciar a extensão ``http.response.zerocopysend`` (ex:
+    Uvicorn/Hypercorn com ``sendfile``), o kernel envia o arquivo direto do
+    page cache para o socket, sem cópias em espaço de usuário. Caso contrário,
+    o arquivo é enviado em chunks lidos com ``os.pread`` fora do event loop,
+    já lendo o próximo chunk enquanto o atual é enviado.
+
+    Requisições com ``Range`` de intervalo único (ex: PDF.js carregando o
+    documento sob demanda) recebem ``206 Partial Content`` apenas com o trecho
+    pedido; intervalos fora do arquivo recebem ``416``.
+
+    O serviço é uma aplicação ASGI: não há ``wsgi.file_wrapper`` nem acesso ao
+    transporte para ``loop.sendfile``. Para ``sendfile(2)`` atrás do gunicorn,
+    use workers Uvicorn, que expõem o caminho zero-copy acima.
+    """
+
+    def init_headers(self, headers=None):
+        # PDFs sem cabeçalhos extras partem do bloco pré-codificado
+        if headers is None and self.media_type == "application/pdf":
+            self.raw_headers = list(_PDF_STATIC_HEADERS)
+            return
+        super().init_headers(headers)
+
+    def set_stat_headers(self, stat_result):
+        content_length, last_modified, etag = _stat_header_values(
+            stat_result.st_size, stat_result.st_mtime
+        )
+        present = {name for name, _ in self.raw_headers}
+        for name, value in (
+            (b"content-length", content_length),
+            (b"last-modified", last_modified),
+            (b"etag", etag),
+        ):
+            if name not in present:
+                self.raw_headers.append((name, value))
+
+    async def __call__(self, scope, receive, send):
+        zerocopy = "http.response.zerocopysend" in scope.get("extensions", {})
+        if not zerocopy and not hasattr(os, "pread"):
+            await super().__call__(scope, receive, send)
+            return
+
+        stat_result = self.stat_result
+        if stat_result is None:
+            try:
+                stat_result = await asyncio.to_thread(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            self.set_stat_headers(stat_result)
+
+        file_size = stat_result.st_size
+        self.headers.setdefault("accept-ranges", "bytes")
+        status_code = self.status_code
+        offset, count = 0, file_size
+        try:
+            byte_range = self._requested_range(scope, file_size)
+        except ValueError:
+            await self._send_range_not_satisfiable(file_size, send)
+            if self.background is not None:
+                await self.background()
+            return
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = 206
+            offset, count = start, end - start + 1
+            self.headers["content-length"] = str(count)
+            self.headers["content-range"] = f"bytes {start}-{end}/{file_size}"
+
+        file = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            if scope["method"].upper() == "HEAD":
+                await send({"type": "http.response.body", "body": b""})
+            elif zerocopy:
+                message = {
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "more_body": False,
+                }
+                if byte_range is not None:
+                    message["offset"] = offset
+                    message["count"] = count
+                await send(message)
+            else:
+                await self._send_chunks(file.fileno(), offset, count, send)
+        finally:
+            file.close()
+
+        if self.background is not None:
+            await self.background()
+
+    def _requested_range(self, scope, file_size: int) -> Optional[Tuple[int, int]]:
+        """Intervalo pedido pelo cliente, se a resposta parcial se aplicar."""
+        if self.status_code != 200:
+            return None
+        headers = dict(scope.get("headers", ()))
+        range_header = headers.get(b"range")
+        if range_header is None:
+            return None
+
+        # If-Range: só responder parcialmente se a versão do cliente for a atual
+        if_range = headers.get(b"if-range")
+        if if_range is not None and if_range.decode("latin-1") not in (
+            self.headers.get("etag"),
+            self.headers.get("last-modified"),
+        ):
+            return None
+
+        return parse_byte_range(range_header.decode("latin-1"), file_size)
+
+    async def _send_range_not_satisfiable(self, file_size: int, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 416,
+                "headers": [
+                    (b"content-range", f"bytes */{file_size}".encode("latin-1")),
+                    (b"content-length", b"0"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _send_chunks(self, fd: int, offset: int, count: int, send):
+        """Envia ``count`` bytes a partir de ``offset``, lendo o próximo chunk antecipadamente."""
+        loop = asyncio.get_running_loop()
+        end = offset + count
+
+        def read_at(position):
+            size = min(PDF_CHUNK_SIZE, end - position)
+            return loop.run_in_executor(_FILE_IO_EXECUTOR, os.pread, fd, size, position)
+
+        pending = read_at(offset)
+        try:
+            while True:
+                chunk = await pending
+                pending = None
+                offset += len(chunk)
+                more_body = bool(chunk) and offset < end
+                if more_body:
+                    pending = read_at(offset)
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": more_body}
+                )
+                if not more_body:
+                    break
+        finally:
+            # Não fechar o arquivo com uma leitura ainda em andamento
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+
+
+def accel_redirect_response(
+    file_path: str, media_type: str, filename: str
+) -> Optional[Response]:
+    """
+    Resposta vazia com ``X-Accel-Redirect`` para o proxy reverso enviar o arquivo.
+
+    O worker fica livre logo após enviar os cabeçalhos; o nginx serve o arquivo
+    com ``sendfile(2)`` a partir do prefixo interno configurado.
+
+    Returns:
+        Optional[Response]: None se o redirecionamento estiver desativado ou o
+        arquivo estiver fora de ``DOCUMENT_STORAGE_PATH``
+    """
+    prefix = settings.DOCUMENT_ACCEL_REDIRECT_PREFIX
+    if not prefix:
+        return None
+
+    relative_path = os.path.relpath(file_path, settings.DOCUMENT_STORAGE_PATH)
+    if relative_path.startswith(os.pardir):
+        return None
+
+    # Mesmo formato de Content-Disposition usado pelo FileResponse do Starlette
+    quoted_filename = quote(filename)
+    if quoted_filename != filename:
+        content_disposition = f"attachment; filename*=utf-8''{quoted_filename}"
+    else:
+        content_disposition = f'attachment; filename="{filename}"'
+
+    return Response(
+        media_type=media_type,
+        headers={
+            "X-Accel-Redirect": prefix.rstrip("/") + "/" + quote(relative_path),
+            "Content-Disposition": content_disposition,
+        },
+    )
+
+
+# Cache de metadados de arquivo dos documentos
+class DocumentMeta(NamedTuple):
+    """Metadados necessários para servir o arquivo de um documento."""
+
+    file_path: str
+    file_type: str
+    filename: str
+    file_size: int
+    file_mtime_ns: Optional[int]
+
+    @classmethod
+    def from_document(cls, document: "Document") -> "DocumentMeta":
+        return cls(
+            file_path=document.file_path,
+            file_type=document.file_type,
+            filename=os.path.basename(document.file_path),
+            file_size=document.file_size,
+            file_mtime_ns=document.file_mtime_ns,
+        )
+
+    def stat_result(self) -> Optional[os.stat_result]:
+        """
+        ``stat_result`` montado a partir dos valores gravados no upload, para
+        que a resposta de download não precise chamar ``os.stat``.
+        """
+        if self.file_mtime_ns is None:
+            return None
+        mtime = self.file_mtime_ns / 1e9
+        return os.stat_result(
+            (stat.S_IFREG, 0, 0, 0, 0, 0, self.file_size, mtime, mtime, mtime)
+        )
+
+
+class _DocumentMetaCache:
+    """Cache LRU em memória, seguro entre threads, de ``DocumentMeta`` por documento."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, DocumentMeta]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, document_id: str) -> Optional[DocumentMeta]:
+        with self._lock:
+            meta = self._data.get(document_id)
+            if meta is not None:
+                self._data.move_to_end(document_id)
+            return meta
+
+    def set(self, document_id: str, meta: DocumentMeta) -> None:
+        with self._lock:
+            self._data[document_id] = meta
+            self._data.move_to_end(document_id)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_document_meta_cache = _DocumentMetaCache()
+
+
+# Registros na blockchain em andamento (ver SignatureService.sign_document)
+_registration_tasks: set = set()
+
+
+def _store_blockchain_registration(
+    bind, document_id: str, blockchain_result: Dict[str, Any]
+):
+    """Grava a transação e a prova de Merkle no documento (roda no threadpool)."""
+    with Session(bind=bind) as db:
+        db.query(Document).filter(
+            Document.id == document_id, Document.blockchain_tx.is_(None)
+        ).update(
+            {
+                Document.blockchain_tx: blockchain_result["tx_hash"],
+                Document.blockchain_block: blockchain_result["block_number"],
+                Document.merkle_root: blockchain_result["merkle_root"],
+                Document.merkle_proof: blockchain_result["merkle_proof"],
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+
+
+def _load_pending_registrations(
+    db: Session, older_than: datetime, limit: int
+) -> List[Tuple[str, str, List[str]]]:
+    """
+    Lista documentos concluídos que ainda não têm transação na blockchain.
+
+    Returns:
+        List: Tuplas ``(document_id, file_hash, signers)``
+    """
+    documents = (
+        db.query(Document)
+        .options(load_only(Document.id, Document.file_hash))
+        .filter(
+            Document.status == DocumentStatus.COMPLETED.value,
+            Document.blockchain_tx.is_(None),
+            Document.updated_at < older_than,
+        )
+        .order_by(Document.updated_at)
+        .limit(limit)
+        .all()
+    )
+    if not documents:
+        return []
+
+    signers: Dict[str, List[str]] = {document.id: [] for document in documents}
+    rows = db.query(Signature.document_id, Signature.signer_email).filter(
+        Signature.document_id.in_(list(signers)),
+        Signature.status == SignatureStatus.SIGNED.value,
+    )
+    for document_id, signer_email in rows:
+        signers[document_id].append(signer_email)
+
+    return [
+        (document.id, document.file_hash, signers[document.id])
+        for document in documents
+    ]
+
+
 # Classe principal do serviço de assinatura
 class SignatureService:
     """
@@ -340,9 +1257,11 @@ class SignatureService:
     verificação de assinaturas digitais em documentos.
     """
 
-    def __init__(self, db_session: Session):
+    def __init__(
+        self, db_session: Session, blockchain: Optional[BlockchainService] = None
+    ):
         self.db = db_session
-        self.blockchain = BlockchainService()
+        self.blockchain = blockchain or BlockchainService()
 
     async def create_document(
         self, user_id: str, document_data: DocumentCreate, file: UploadFile
@@ -373,12 +1292,12 @@ class SignatureService:
 
         # Salvar o arquivo
         file_path = os.path.join(doc_dir, f"original_{file.filename}")
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        content = await file.read()
+        await asyncio.to_thread(_write_file, file_path, content)
 
-        # Calcular hash do arquivo
-        file_hash = calculate_file_hash(file_path)
+        # Calcular hash e stat do arquivo (fora do event loop)
+        file_hash = await asyncio.to_thread(calculate_file_hash, file_path)
+        file_stat = await asyncio.to_thread(os.stat, file_path)
 
         # Criar registro do documento
         document = Document(
@@ -389,7 +1308,8 @@ class SignatureService:
             creator_id=user_id,
             file_path=file_path,
             file_hash=file_hash,
-            file_size=os.path.getsize(file_path),
+            file_size=file_stat.st_size,
+            file_mtime_ns=file_stat.st_mtime_ns,
             file_type=file.content_type,
             status=DocumentStatus.DRAFT.value,
         )
@@ -432,46 +1352,69 @@ class SignatureService:
                 detail=f"Cannot add signatories to document with status {document.status}",
             )
 
-        # Criar registros de assinatura para cada signatário
-        signatures = []
-        for sig_data in signatories:
-            # Verificar se este email já está registrado como signatário
-            existing = (
-                self.db.query(Signature)
-                .filter(
-                    Signature.document_id == document_id,
-                    Signature.signer_email == sig_data.signer_email,
-                )
-                .first()
-            )
+        # Emails já registrados como signatários, obtidos com uma única consulta
+        existing_emails = {
+            email
+            for (email,) in self.db.query(Signature.signer_email)
+            .filter(Signature.document_id == document_id)
+            .all()
+        }
 
-            if existing:
+        # Montar as linhas dos novos signatários para uma inserção em lote
+        new_sigs = []
+        for sig_data in signatories:
+            if sig_data.signer_email in existing_emails:
                 continue  # Pular este signatário, já está registrado
 
-            signature = Signature(
-                document_id=document_id,
-                signer_email=sig_data.signer_email,
-                signer_name=sig_data.signer_name,
-                signer_role=sig_data.signer_role,
-                status=SignatureStatus.PENDING.value,
-                signature_token=generate_signature_token(),
-                position_x=sig_data.position_x,
-                position_y=sig_data.position_y,
-                page=sig_data.page,
+            existing_emails.add(sig_data.signer_email)
+            new_sigs.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "document_id": document_id,
+                    "signer_email": sig_data.signer_email,
+                    "signer_name": sig_data.signer_name,
+                    "signer_role": sig_data.signer_role,
+                    "status": SignatureStatus.PENDING.value,
+                    "signature_token": generate_signature_token(),
+                    "position_x": sig_data.position_x,
+                    "position_y": sig_data.position_y,
+                    "page": sig_data.page,
+                }
             )
 
-            self.db.add(signature)
-            signatures.append(signature)
+        # Um único INSERT multi-linha em vez de um INSERT por signatário;
+        # duplicatas inseridas concorrentemente são ignoradas pelo banco
+        if new_sigs:
+            dialect = self.db.get_bind().dialect.name
+            if dialect == "postgresql":
+                stmt = pg_insert(Signature).on_conflict_do_nothing(
+                    index_elements=["document_id", "signer_email"]
+                )
+            elif dialect == "sqlite":
+                stmt = sqlite_insert(Signature).on_conflict_do_nothing(
+                    index_elements=["document_id", "signer_email"]
+                )
+            else:
+                stmt = insert(Signature)
+            self.db.execute(stmt, new_sigs)
 
-        # Atualizar status do documento para pendente se houver signatários
-        if signatures and document.status == DocumentStatus.DRAFT.value:
-            document.status = DocumentStatus.PENDING.value
+            # Atualizar status do documento para pendente
+            if document.status == DocumentStatus.DRAFT.value:
+                document.status = DocumentStatus.PENDING.value
 
         self.db.commit()
 
-        # Atualizar objetos com dados do banco
-        for sig in signatures:
-            self.db.refresh(sig)
+        # Carregar os registros criados com uma única consulta
+        signatures = []
+        if new_sigs:
+            new_ids = [row["id"] for row in new_sigs]
+            by_id = {
+                sig.id: sig
+                for sig in self.db.query(Signature)
+                .filter(Signature.id.in_(new_ids))
+                .all()
+            }
+            signatures = [by_id[sig_id] for sig_id in new_ids if sig_id in by_id]
 
         logger.info(f"Added {len(signatures)} signatories to document {document_id}")
         return signatures
@@ -507,8 +1450,10 @@ class SignatureService:
                 detail=f"Signature {signature_id} not found",
             )
 
-        # Verificar se o token é válido
-        if signature.signature_token != token:
+        # Verificar se o token é válido (comparação em tempo constante)
+        if not hmac.compare_digest(
+            signature.signature_token.encode(), token.encode()
+        ):
             raise HTTPException(
                 status_code=HTTP_400_BAD_REQUEST, detail="Invalid signature token"
             )
@@ -578,22 +1523,90 @@ class SignatureService:
                 .all()
             ]
 
-            # Registrar na blockchain
-            blockchain_result = await self.blockchain.register_document(
-                document.file_hash, signers
-            )
-
-            # Atualizar documento com informações da blockchain
-            document.blockchain_tx = blockchain_result["tx_hash"]
-            document.blockchain_block = blockchain_result["block_number"]
             document.status = DocumentStatus.COMPLETED.value
 
+        # A assinatura é gravada antes do registro na blockchain: o lote de Merkle
+        # pode levar até MERKLE_BATCH_INTERVAL para ser enviado, e a requisição
+        # não deve esperar por ele com a transação do banco aberta
         self.db.commit()
         self.db.refresh(signature)
 
+        if pending_signatures == 0:
+            self._schedule_blockchain_registration(
+                document.id, document.file_hash, signers
+            )
+
         logger.info(f"Document {document.id} signed by {signature.signer_email}")
         return signature
 
+    def _schedule_blockchain_registration(
+        self, document_id: str, file_hash: str, signers: List[str]
+    ):
+        """Registra o documento no próximo lote de Merkle, em segundo plano."""
+        task = asyncio.create_task(
+            self._register_on_blockchain(document_id, file_hash, signers)
+        )
+        # Referência forte até o fim: o event loop guarda apenas referências fracas
+        _registration_tasks.add(task)
+        task.add_done_callback(_registration_tasks.discard)
+
+    async def _register_on_blockchain(
+        self, document_id: str, file_hash: str, signers: List[str]
+    ):
+        """Aguarda o lote e grava a transação e a prova de Merkle no documento."""
+        try:
+            blockchain_result = await self.blockchain.register_document_batched(
+                file_hash, signers
+            )
+        except Exception as e:
+            # O documento segue COMPLETED sem blockchain_tx, e a varredura de
+            # pendentes (register_pending_documents) tenta de novo
+            logger.error(
+                f"Error registering document {document_id} on blockchain: {str(e)}"
+            )
+            return
+
+        # A sessão da requisição já pode ter sido fechada: usa uma sessão própria,
+        # com uma conexão do pool do mesmo engine, fora do event loop
+        await asyncio.to_thread(
+            _store_blockchain_registration,
+            self.db.get_bind(),
+            document_id,
+            blockchain_result,
+        )
+
+    async def register_pending_documents(self) -> int:
+        """
+        Registra na blockchain os documentos concluídos ainda sem transação.
+
+        Cobre registros perdidos (falha do nó, reinício do processo) no caminho
+        em segundo plano de ``sign_document``. Só considera documentos concluídos
+        há mais de ``MERKLE_SUBMIT_TIMEOUT`` segundos, para não repetir registros
+        que ainda estão aguardando o lote.
+
+        Returns:
+            int: Quantidade de documentos submetidos
+        """
+        older_than = datetime.utcnow() - timedelta(
+            seconds=settings.MERKLE_SUBMIT_TIMEOUT
+        )
+        pending = await asyncio.to_thread(
+            _load_pending_registrations,
+            self.db,
+            older_than,
+            settings.BLOCKCHAIN_ANCHOR_SWEEP_LIMIT,
+        )
+        if pending:
+            # Submetidos juntos, os documentos entram nos mesmos lotes de Merkle
+            await asyncio.gather(
+                *(
+                    self._register_on_blockchain(document_id, file_hash, signers)
+                    for document_id, file_hash, signers in pending
+                )
+            )
+            logger.info(f"Submitted {len(pending)} pending documents to blockchain")
+        return len(pending)
+
     async def verify_document(self, document_id: str) -> SignatureVerification:
         """
         Verifica a autenticidade e integridade de um documento assinado.
@@ -619,19 +1632,34 @@ class SignatureService:
                 detail=f"Document has status {document.status}, not completed",
             )
 
-        # Calcular hash atual do arquivo
-        current_hash = calculate_file_hash(document.file_path)
+        # Calcular digest atual do arquivo (fora do event loop)
+        current_digest = await asyncio.to_thread(
+            _calculate_file_digest, document.file_path
+        )
 
-        # Verificar se o hash atual corresponde ao hash original
-        hash_valid = current_hash == document.file_hash
+        # Verificar se o digest atual corresponde ao hash original
+        hash_valid = hmac.compare_digest(
+            current_digest, bytes.fromhex(document.file_hash)
+        )
 
         # Verificar registro na blockchain
         blockchain_verified = False
         if document.blockchain_tx:
+            registered_hash = document.file_hash
+            proof_valid = True
+            if document.merkle_proof is not None:
+                # Registrado em lote: a blockchain guarda a raiz da árvore de Merkle
+                registered_hash = compute_merkle_root(
+                    document.file_hash, document.merkle_proof
+                )
+                proof_valid = hmac.compare_digest(
+                    registered_hash, document.merkle_root or ""
+                )
+
             blockchain_result = await self.blockchain.verify_document(
-                document.file_hash, document.blockchain_tx
+                registered_hash, document.blockchain_tx
             )
-            blockchain_verified = blockchain_result["valid"]
+            blockchain_verified = proof_valid and blockchain_result["valid"]
 
         # Obter informações das assinaturas
         signatures = (
@@ -657,7 +1685,8 @@ class SignatureService:
                 }
             )
 
-        return SignatureVerification(
+        # Payload montado internamente a partir do banco: dispensa revalidação
+        return SignatureVerification.model_construct(
             valid=hash_valid and blockchain_verified,
             document_hash=document.file_hash,
             blockchain_verified=blockchain_verified,
@@ -687,6 +1716,77 @@ class SignatureService:
             )
         return document
 
+    def get_document_meta(self, document_id: str) -> DocumentMeta:
+        """
+        Obtém os metadados de arquivo de um documento, com cache em memória.
+
+        Downloads repetidos do mesmo documento não consultam o banco.
+
+        Args:
+            document_id: ID do documento
+
+        Returns:
+            DocumentMeta: Caminho, tipo, nome, tamanho e mtime do arquivo
+        """
+        meta = _document_meta_cache.get(document_id)
+        if meta is None:
+            document = self.get_document(document_id)
+            meta = DocumentMeta.from_document(document)
+            _document_meta_cache.set(document_id, meta)
+        return meta
+
+    def get_documents_bulk(self, document_ids: List[str]) -> Dict[str, DocumentMeta]:
+        """
+        Obtém os metadados de arquivo de vários documentos em uma única consulta.
+
+        Documentos já em cache não são consultados; os demais são carregados
+        com um único SELECT ... IN, trazendo apenas as colunas necessárias.
+
+        Args:
+            document_ids: IDs dos documentos
+
+        Returns:
+            Dict[str, DocumentMeta]: Metadados por ID, na ordem dos IDs informados
+            e sem repetições
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        metas = {}
+        missing = []
+        for document_id in document_ids:
+            meta = _document_meta_cache.get(document_id)
+            if meta is None:
+                missing.append(document_id)
+            else:
+                metas[document_id] = meta
+
+        if missing:
+            documents = (
+                self.db.query(Document)
+                .options(
+                    load_only(
+                        Document.id,
+                        Document.file_path,
+                        Document.file_type,
+                        Document.file_size,
+                        Document.file_mtime_ns,
+                    )
+                )
+                .filter(Document.id.in_(missing))
+                .all()
+            )
+            for document in documents:
+                meta = DocumentMeta.from_document(document)
+                _document_meta_cache.set(document.id, meta)
+                metas[document.id] = meta
+
+        not_found = [document_id for document_id in document_ids if document_id not in metas]
+        if not_found:
+            raise HTTPException(
+                status_code=HTTP_404_NOT_FOUND,
+                detail=f"Documents not found: {', '.join(not_found)}",
+            )
+        return {document_id: metas[document_id] for document_id in document_ids}
+
     def get_signature(self, signature_id: str) -> Signature:
         """
         Obtém uma assinatura pelo ID.
@@ -784,7 +1884,43 @@ def create_signature_router(get_db_session):
     Returns:
         APIRouter: Router FastAPI configurado
     """
-    router = FastAPI(title="prudentIA - Serviço de Assinatura Digital")
+    # Uma única instância compartilhada para que as chamadas à blockchain de
+    # requisições concorrentes possam ser agrupadas no mesmo lote
+    blockchain = BlockchainService()
+
+    session_scope = contextmanager(get_db_session)
+
+    async def sweep_pending_registrations():
+        # Retoma periodicamente os registros na blockchain que não foram concluídos
+        while True:
+            await asyncio.sleep(settings.BLOCKCHAIN_ANCHOR_SWEEP_INTERVAL)
+            try:
+                with session_scope() as db:
+                    await SignatureService(db, blockchain).register_pending_documents()
+            except Exception as e:
+                logger.error(f"Error sweeping pending blockchain registrations: {str(e)}")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        sweeper = asyncio.create_task(sweep_pending_registrations())
+        yield
+        sweeper.cancel()
+        try:
+            await sweeper
+        except asyncio.CancelledError:
+            pass
+        await blockchain.aclose()
+
+    async def get_service(db: Session = Depends(get_db_session)) -> SignatureService:
+        # async: roda no event loop, sem passar pelo threadpool; o FastAPI
+        # reaproveita o resultado para todas as dependências da mesma requisição
+        return SignatureService(db, blockchain)
+
+    router = FastAPI(
+        title="prudentIA - Serviço de Assinatura Digital",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
 
     @router.post(
         "/documents", response_model=DocumentResponse, status_code=HTTP_201_CREATED
@@ -797,11 +1933,9 @@ def create_signature_router(get_db_session):
         user_id: str = Depends(
             lambda: "current_user_id"
         ),  # Substituir por autenticação real
-        db: Session = Depends(get_db_session),
+        service: SignatureService = Depends(get_service),
     ):
         """Cria um novo documento para assinatura."""
-        service = SignatureService(db)
-
         document_data = DocumentCreate(title=title, description=description)
 
         document = await service.create_document(user_id, document_data, file)
@@ -813,10 +1947,9 @@ def create_signature_router(get_db_session):
     def add_signatories(
         document_id: str,
         signatories: List[SignatureCreate],
-        db: Session = Depends(get_db_session),
+        service: SignatureService = Depends(get_service),
     ):
         """Adiciona signatários a um documento."""
-        service = SignatureService(db)
         signatures = service.add_signatories(document_id, signatories)
         return signatures
 
@@ -826,33 +1959,35 @@ def create_signature_router(get_db_session):
         token: str = Query(...),
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-        db: Session = Depends(get_db_session),
+        service: SignatureService = Depends(get_service),
     ):
         """Assina um documento."""
-        service = SignatureService(db)
         signature = await service.sign_document(
             signature_id, token, None, ip_address, user_agent
         )
         return signature
 
     @router.get("/documents/{document_id}/verify", response_model=SignatureVerification)
-    async def verify_document(document_id: str, db: Session = Depends(get_db_session)):
+    async def verify_document(
+        document_id: str, service: SignatureService = Depends(get_service)
+    ):
         """Verifica a autenticidade e integridade de um documento assinado."""
-        service = SignatureService(db)
         verification = await service.verify_document(document_id)
         return verification
 
     @router.get("/documents/{document_id}", response_model=DocumentResponse)
-    def get_document(document_id: str, db: Session = Depends(get_db_session)):
+    def get_document(
+        document_id: str, service: SignatureService = Depends(get_service)
+    ):
         """Obtém informações de um documento."""
-        service = SignatureService(db)
         document = service.get_document(document_id)
         return document
 
     @router.get("/signatures/{signature_id}")
-    def get_signature_url(signature_id: str, db: Session = Depends(get_db_session)):
+    def get_signature_url(
+        signature_id: str, service: SignatureService = Depends(get_service)
+    ):
         """Gera uma URL para assinatura."""
-        service = SignatureService(db)
         url = service.get_signature_url(signature_id)
         return {"signature_url": url}
 
@@ -862,29 +1997,71 @@ def create_signature_router(get_db_session):
         user_id: str = Depends(
             lambda: "current_user_id"
         ),  # Substituir por autenticação real
-        db: Session = Depends(get_db_session),
+        service: SignatureService = Depends(get_service),
     ):
         """Revoga um documento."""
-        service = SignatureService(db)
         document = service.revoke_document(document_id, user_id)
         return document
 
     @router.get("/documents/{document_id}/download")
-    def download_document(document_id: str, db: Session = Depends(get_db_session)):
+    def download_document(
+        document_id: str, service: SignatureService = Depends(get_service)
+    ):
         """Faz download de um documento."""
-        service = SignatureService(db)
-        document = service.get_document(document_id)
-        return FileResponse(
-            document.file_path,
+        meta = service.get_document_meta(document_id)
+        response = accel_redirect_response(
+            meta.file_path, "application/pdf", meta.filename
+        )
+        if response is not None:
+            return response
+        return PDFFileResponse(
+            meta.file_path,
             media_type="application/pdf",
-            filename=os.path.basename(document.file_path),
+            filename=meta.filename,
+            stat_result=meta.stat_result(),
+        )
+
+    @router.post("/documents:batch_download")
+    def batch_download_documents(
+        document_ids: List[str], service: SignatureService = Depends(get_service)
+    ):
+        """Faz download de vários documentos em um único arquivo ZIP."""
+        # Endpoint síncrono: a consulta e a montagem do ZIP rodam no threadpool
+        # do FastAPI, fora do event loop
+        if not document_ids:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST, detail="No documents requested"
+            )
+        if len(document_ids) > settings.BATCH_DOWNLOAD_MAX_DOCUMENTS:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"At most {settings.BATCH_DOWNLOAD_MAX_DOCUMENTS} documents "
+                    "per batch download"
+                ),
+            )
+
+        metas = service.get_documents_bulk(document_ids)
+
+        # Cada documento fica em uma pasta com seu ID, evitando colisão de nomes
+        entries = [
+            (meta.file_path, f"{document_id}/{meta.filename}")
+            for document_id, meta in metas.items()
+        ]
+        archive_path = _build_zip_archive(entries)
+        return PDFFileResponse(
+            archive_path,
+            media_type="application/zip",
+            filename="documents.zip",
+            background=BackgroundTask(os.remove, archive_path),
         )
 
     return router
 
 
 # Exemplo de uso
-if __name__ == "__main__":
+def _run_local():
+    """Sobe a API com um banco SQLite em memória, para teste local."""
     import uvicorn
 
     # Configuração de exemplo para teste local
@@ -892,7 +2069,11 @@ if __name__ == "__main__":
     from sqlalchemy.orm import sessionmaker
 
     # Criar banco de dados SQLite em memória para teste
-    engine = create_engine("sqlite:///:memory:")
+    engine = create_engine(
+        "sqlite:///:memory:",
+        json_serializer=lambda obj: orjson.dumps(obj).decode(),
+        json_deserializer=orjson.loads,
+    )
     Base.metadata.create_all(engine)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -905,4 +2086,16 @@ if __name__ == "__main__":
 
     # Criar e iniciar a API
     app = create_signature_router(get_db)
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        interface="asgi3",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    _run_local()
@@ -13,7 +13,28 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prudentia.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+_HEALTH_RESPONSE_START = {
+    'type': 'http.response.start',
+    'status': 200,
+    'headers': [(b'content-type', b'text/plain'), (b'content-length', b'2')],
+}
+_HEALTH_RESPONSE_BODY = {'type': 'http.response.body', 'body': b'OK'}
+
+
+async def application(scope, receive, send):
+    """
+    Answer load-balancer probes on /health at the ASGI layer, without going
+    through Django's middleware stack and URL resolver. Everything else is
+    handed to the Django application.
+    """
+    if scope['type'] == 'http' and scope['path'] == '/health':
+        await send(_HEALTH_RESPONSE_START)
+        await send(_HEALTH_RESPONSE_BODY)
+        return
+    await django_application(scope, receive, send)
+
 
 # If you are using Django Channels for WebSockets, you would add more configuration here.
 # For example:
@@ -1,5 +1,10 @@
+import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 # Defina o módulo de configurações padrão do Django para o 'celery'.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prudentia.settings')
@@ -13,9 +18,62 @@ app = Celery('prudentia')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Carregar módulos de tarefas de todas as aplicações Django registradas.
+# A busca é adiada pelo Celery até a finalização da app, sem importar nada aqui.
 app.autodiscover_tasks()
 
+logger = logging.getLogger(__name__)
+
+
+# Listeners de log do processo atual (um por handler), parados no encerramento
+_log_listeners = []
+
+
+@worker_process_init.connect
+def _log_through_queue(**kwargs):
+    """
+    Move a escrita dos logs de cada processo filho do pool para threads de fundo.
+
+    Roda em worker_process_init, já no processo filho: um QueueListener iniciado
+    no processo pai antes do fork não existiria nos filhos, e os registros
+    ficariam presos na fila. Cada handler do Celery ganha uma fila própria; o
+    QueueHandler formata o registro com o formatter original ainda na thread da
+    tarefa (o TaskFormatter precisa da tarefa corrente para task_id/task_name), e
+    o handler original, na thread do listener, só escreve a mensagem pronta.
+    """
+    wrapped = {}
+    for target in (logging.getLogger(), logging.getLogger('celery.task')):
+        queue_handlers = []
+        for handler in target.handlers:
+            if isinstance(handler, QueueHandler):
+                queue_handlers.append(handler)
+                continue
+            if handler in wrapped:
+                # Mesmo handler nos dois loggers: reaproveita a fila já criada
+                queue_handlers.append(wrapped[handler])
+                continue
+
+            log_queue = queue.SimpleQueue()
+            queue_handler = QueueHandler(log_queue)
+            queue_handler.setLevel(handler.level)
+            queue_handler.setFormatter(handler.formatter)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+
+            listener = QueueListener(log_queue, handler, respect_handler_level=True)
+            listener.start()
+            _log_listeners.append(listener)
+            wrapped[handler] = queue_handler
+            queue_handlers.append(queue_handler)
+        target.handlers = queue_handlers
+
+
+@worker_process_shutdown.connect
+def _stop_log_listeners(**kwargs):
+    # Esvazia as filas antes de o processo filho terminar
+    while _log_listeners:
+        _log_listeners.pop().stop()
+
 
 @app.task(bind=True)
 def debug_task(self):
-    print(f'Request: {self.request!r}')
+    # Formatação adiada: repr(self.request) só é calculado se DEBUG estiver ativo
+    logger.debug('Request: %r', self.request)
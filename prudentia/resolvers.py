@@ -0,0 +1,58 @@
+"""
+Resolvers de URL customizados do projeto prudentia.
+"""
+
+from django.urls import Resolver404, URLResolver
+from django.urls.resolvers import RoutePattern
+from django.utils.functional import cached_property
+
+
+class PrefixTrieResolver(URLResolver):
+    """
+    URLResolver que despacha pelo primeiro segmento do caminho.
+
+    Os padrões são agrupados pelo primeiro segmento estático da rota
+    ('accounts', 'clients', ...) e cada requisição é resolvida apenas no grupo
+    correspondente, com uma consulta a dicionário em vez de testar todos os
+    padrões em sequência. Caminhos sem grupo, ou que não casam no grupo, seguem
+    a resolução padrão do Django (preservando a lista de padrões testados no 404).
+    """
+
+    def __init__(self, route, urlpatterns, **kwargs):
+        super().__init__(RoutePattern(route, is_endpoint=False), urlpatterns, **kwargs)
+
+    @cached_property
+    def _resolvers_by_prefix(self):
+        groups = {}
+        for url_pattern in self.url_patterns:
+            route = str(url_pattern.pattern)
+            # Só é seguro agrupar rotas com primeiro segmento estático e completo
+            if not isinstance(url_pattern.pattern, RoutePattern) or "/" not in route:
+                return {}
+            prefix = route.split("/", 1)[0]
+            if "<" in prefix:
+                return {}
+            groups.setdefault(prefix, []).append(url_pattern)
+
+        return {
+            prefix: URLResolver(
+                self.pattern,
+                patterns,
+                self.default_kwargs,
+                self.app_name,
+                self.namespace,
+            )
+            for prefix, patterns in groups.items()
+        }
+
+    def resolve(self, path):
+        match = self.pattern.match(str(path))
+        if match:
+            new_path = match[0]
+            resolver = self._resolvers_by_prefix.get(new_path.split("/", 1)[0])
+            if resolver is not None:
+                try:
+                    return resolver.resolve(path)
+                except Resolver404:
+                    pass
+        return super().resolve(path)
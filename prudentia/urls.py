@@ -16,7 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import .settings
+from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -24,6 +24,8 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from .resolvers import PrefixTrieResolver
+
 # API URL patterns
 api_urlpatterns = [
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -45,7 +47,8 @@ api_urlpatterns = [
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/v1/', include(api_urlpatterns)),
+    # Despacho por prefixo: um lookup em dicionário em vez de testar cada rota da API
+    PrefixTrieResolver('api/v1/', api_urlpatterns),
     # Include DRF's login/logout views for the browsable API (optional, useful for development)
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework')),
 ]
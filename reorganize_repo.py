@@ -6,10 +6,64 @@ Este script reorganiza os arquivos do repositório, movendo os arquivos de confi
 do Django para o diretório prudentia/ e configurando a estrutura correta.
 """
 
+import errno
+import mmap
 import os
+import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# pygit2 (libgit2) é opcional: com ele o commit é feito no próprio processo;
+# sem ele, o script usa o git de linha de comando
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Arquivos de configuração do Django movidos da raiz para prudentia/
+DJANGO_FILES = ["settings.py", "urls.py", "wsgi.py", "asgi.py", "celery.py"]
+
+# Caminhos afetados pela reorganização (status e commit)
+GIT_PATHS = ["prudentia/", *DJANGO_FILES]
+
+# Importações absolutas entre os módulos movidos, reescritas como relativas em uma
+# única passada. "celery" fica de fora: "from celery import Celery" em celery.py
+# refere-se ao pacote instalado, não ao módulo local.
+IMPORT_RE = re.compile(
+    r'^([ \t]*)(?:from[ \t]+(settings|urls|wsgi|asgi)[ \t]+import\b'
+    r'|import[ \t]+(settings|urls|wsgi|asgi)\b(?!\.))',
+    re.MULTILINE,
+)
+
+# Nomes que precisam aparecer no arquivo para que IMPORT_RE possa casar
+IMPORT_TOKENS = (b"settings", b"urls", b"wsgi", b"asgi")
+
+def has_import_candidates(file_path):
+    """
+    Procura os nomes de IMPORT_TOKENS direto nos bytes do arquivo (mmap.find)
+
+    Arquivos sem nenhum deles são descartados sem decodificar o conteúdo nem
+    rodar a expressão regular.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False  # mmap não aceita arquivos vazios
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return any(mm.find(token) != -1 for token in IMPORT_TOKENS)
+
+def _relative_import(match):
+    indent, from_module, import_module = match.groups()
+    if from_module:
+        # from settings import XYZ -> from .settings import XYZ
+        return f"{indent}from .{from_module} import"
+    # import settings -> from . import settings
+    return f"{indent}from . import {import_module}"
+
+# Máximo de linhas do git status exibidas antes da confirmação do commit
+MAX_STATUS_LINES = 200
 
 # Cores para terminal
 class Colors:
@@ -20,18 +74,49 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# Sem terminal (pipe, CI) ou com NO_COLOR definido, a saída vai sem códigos ANSI
+USE_COLORS = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+# Formatos prontos por cor, montados uma única vez
+COLOR_FORMATS = {
+    color: f"{color}{{}}{Colors.END}" if USE_COLORS else "{}"
+    for color in (Colors.GREEN, Colors.YELLOW, Colors.RED, Colors.BOLD + Colors.BLUE)
+}
+
+class OutputBuffer:
+    """Acumula as linhas de saída e as escreve no terminal com um único write()"""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def write(self, text):
+        self.lines.append(f"{text}\n")
+    
+    def flush(self):
+        if self.lines:
+            sys.stdout.write("".join(self.lines))
+            self.lines.clear()
+        sys.stdout.flush()
+
+# A saída de cada etapa é escrita de uma vez, quando a próxima etapa começa
+stdout_buffer = OutputBuffer()
+
 def print_colored(text, color):
     """Imprime texto colorido no terminal"""
-    print(f"{color}{text}{Colors.END}")
+    color_format = COLOR_FORMATS.get(color)
+    if color_format is None:
+        color_format = COLOR_FORMATS[color] = f"{color}{{}}{Colors.END}" if USE_COLORS else "{}"
+    stdout_buffer.write(color_format.format(text))
 
 def print_header(text):
     """Imprime um cabeçalho formatado"""
-    print("\n" + "=" * 80)
+    stdout_buffer.write("\n" + "=" * 80)
     print_colored(f" {text} ", Colors.BOLD + Colors.BLUE)
-    print("=" * 80)
+    stdout_buffer.write("=" * 80)
 
 def print_step(text):
     """Imprime um passo da execução"""
+    stdout_buffer.flush()
     print_colored(f"\n➤ {text}", Colors.YELLOW)
 
 def print_success(text):
@@ -44,15 +129,50 @@ def print_error(text):
 
 def print_info(text):
     """Imprime uma informação"""
-    print(f"  {text}")
+    stdout_buffer.write(f"  {text}")
+
+def scan_dir(path):
+    """
+    Lê um diretório uma única vez e retorna {nome: DirEntry}
 
-def run_command(command):
-    """Executa um comando shell e retorna o resultado"""
+    Consultas de existência e tipo passam a ser feitas em memória, sem um
+    stat por arquivo. Um diretório inexistente resulta em um dicionário vazio.
+    """
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name: entry for entry in entries}
+    except FileNotFoundError:
+        return {}
+
+def run_parallel(func, items, max_workers=8):
+    """
+    Executa func para cada item em threads e imprime as mensagens na ordem dos itens
+
+    func deve retornar (resultado, mensagens), onde mensagens é uma lista de
+    (print_*, texto); imprimir só depois evita saída intercalada no terminal.
+    """
+    results = []
+    if not items:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        for result, messages in executor.map(func, items):
+            for printer, text in messages:
+                printer(text)
+            results.append(result)
+    
+    return results
+
+# Ambiente dos comandos git: sem conversão de locale e sem locks opcionais
+COMMAND_ENV = {**os.environ, "LC_ALL": "C", "GIT_OPTIONAL_LOCKS": "0"}
+
+def run_command(argv):
+    """Executa um comando (lista de argumentos, sem shell) e retorna o resultado"""
     try:
         result = subprocess.run(
-            command, 
-            shell=True, 
+            argv, 
             check=True, 
+            env=COMMAND_ENV, 
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE, 
             text=True
@@ -60,11 +180,20 @@ def run_command(command):
         return True, result.stdout
     except subprocess.CalledProcessError as e:
         return False, e.stderr
+    except OSError as e:
+        # Sem shell, um executável ausente (ex: git) chega como FileNotFoundError
+        return False, str(e)
 
 def check_git_repo():
     """Verifica se estamos em um repositório git"""
     print_step("Verificando repositório git...")
-    success, output = run_command("git rev-parse --is-inside-work-tree")
+
+    # Na raiz do repositório basta checar .git (diretório, ou arquivo em worktrees);
+    # o git só é consultado quando ele não está presente
+    if os.path.exists(".git"):
+        success = True
+    else:
+        success, output = run_command(["git", "rev-parse", "--is-inside-work-tree"])
     
     if success:
         print_success("Repositório git encontrado.")
@@ -78,19 +207,19 @@ def create_prudentia_dir():
     """Cria o diretório prudentia/ se não existir"""
     print_step("Verificando/criando diretório prudentia/...")
     
-    if os.path.exists("prudentia"):
+    # mkdir direto: o caso "já existe" chega como FileExistsError, sem um stat prévio
+    try:
+        os.mkdir("prudentia")
+        print_success("Diretório prudentia/ criado com sucesso.")
+    except FileExistsError:
         if os.path.isdir("prudentia"):
             print_success("Diretório prudentia/ já existe.")
         else:
             print_error("prudentia existe, mas não é um diretório!")
             return False
-    else:
-        try:
-            os.mkdir("prudentia")
-            print_success("Diretório prudentia/ criado com sucesso.")
-        except Exception as e:
-            print_error(f"Erro ao criar diretório prudentia/: {e}")
-            return False
+    except OSError as e:
+        print_error(f"Erro ao criar diretório prudentia/: {e}")
+        return False
     
     return True
 
@@ -100,12 +229,10 @@ def create_init_file():
     
     init_path = os.path.join("prudentia", "__init__.py")
     
-    if os.path.exists(init_path):
-        print_success("Arquivo __init__.py já existe.")
-    else:
-        try:
-            with open(init_path, "w") as f:
-                f.write("""# Este arquivo torna o diretório prudentia/ um pacote Python
+    # Modo "x" (O_EXCL): criação atômica, sem checar a existência antes
+    try:
+        with open(init_path, "x", encoding="utf-8") as f:
+            f.write("""# Este arquivo torna o diretório prudentia/ um pacote Python
 # Import Celery app
 try:
     from .celery import app as celery_app
@@ -114,37 +241,58 @@ except ImportError:
     # Celery não configurado ainda
     pass
 """)
-            print_success("Arquivo __init__.py criado com sucesso.")
-        except Exception as e:
-            print_error(f"Erro ao criar arquivo __init__.py: {e}")
-            return False
+        print_success("Arquivo __init__.py criado com sucesso.")
+    except FileExistsError:
+        print_success("Arquivo __init__.py já existe.")
+    except OSError as e:
+        print_error(f"Erro ao criar arquivo __init__.py: {e}")
+        return False
     
     return True
 
+def fast_move(src, dst):
+    """
+    Move src para dst com um rename(2) atômico
+
+    Só quando origem e destino estão em dispositivos diferentes (EXDEV) o
+    arquivo é copiado e removido; nesse caso shutil.move já copia o conteúdo
+    via sendfile(2) no Linux, sem passar por buffers em Python.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+def _move_one(file, root_entries, prudentia_entries):
+    """Move um arquivo para prudentia/; retorna (movido, mensagens)"""
+    if file not in root_entries:
+        return False, [(print_info, f"Arquivo {file} não encontrado na raiz.")]
+    
+    dest_path = os.path.join("prudentia", file)
+    
+    # Verificar se o arquivo já existe no destino
+    if file in prudentia_entries:
+        return False, [(print_info, f"Arquivo {file} já existe em prudentia/")]
+    
+    try:
+        fast_move(file, dest_path)
+        return True, [(print_success, f"Arquivo {file} movido com sucesso.")]
+    except OSError as e:
+        return False, [(print_error, f"Erro ao mover arquivo {file}: {e}")]
+
 def move_django_files():
     """Move os arquivos de configuração do Django para prudentia/"""
     print_step("Movendo arquivos de configuração do Django...")
     
-    django_files = ["settings.py", "urls.py", "wsgi.py", "asgi.py", "celery.py"]
-    moved_files = []
-    
-    for file in django_files:
-        if os.path.exists(file):
-            dest_path = os.path.join("prudentia", file)
-            
-            # Verificar se o arquivo já existe no destino
-            if os.path.exists(dest_path):
-                print_info(f"Arquivo {file} já existe em prudentia/")
-                continue
-                
-            try:
-                shutil.move(file, dest_path)
-                moved_files.append(file)
-                print_success(f"Arquivo {file} movido com sucesso.")
-            except Exception as e:
-                print_error(f"Erro ao mover arquivo {file}: {e}")
-        else:
-            print_info(f"Arquivo {file} não encontrado na raiz.")
+    # Uma leitura de cada diretório substitui os stats de origem e destino por arquivo
+    root_entries = scan_dir(".")
+    prudentia_entries = scan_dir("prudentia")
+    results = run_parallel(
+        lambda file: _move_one(file, root_entries, prudentia_entries), DJANGO_FILES
+    )
+    moved_files = [file for file, moved in zip(DJANGO_FILES, results) if moved]
     
     if not moved_files:
         print_info("Nenhum arquivo precisou ser movido.")
@@ -160,8 +308,7 @@ def update_manage_py():
         return False
     
     try:
-        with open("manage.py", "r") as f:
-            content = f.read()
+        content = Path("manage.py").read_text(encoding="utf-8")
         
         # Verificar se já está configurado corretamente
         if "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prudentia.settings')" in content or \
@@ -173,54 +320,142 @@ def update_manage_py():
         print_info("O arquivo manage.py pode precisar ser atualizado.")
         print_info("Verifique se ele contém: os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'prudentia.settings')")
         
-    except Exception as e:
+    except (OSError, UnicodeDecodeError) as e:
         print_error(f"Erro ao verificar arquivo manage.py: {e}")
     
     return True
 
+def _update_imports_one(file_path):
+    """Reescreve as importações de um arquivo; retorna (None, mensagens)"""
+    try:
+        if not has_import_candidates(file_path):
+            return None, [(print_info, f"Nenhuma atualização necessária em {file_path}")]
+        
+        path = Path(file_path)
+        content = path.read_text(encoding="utf-8")
+        
+        # Substituir importações absolutas por relativas
+        updated_content, count = IMPORT_RE.subn(_relative_import, content)
+        
+        # Em reexecuções normalmente nada casa e o arquivo não é reescrito
+        if count and updated_content != content:
+            path.write_text(updated_content, encoding="utf-8")
+            return None, [(print_success, f"Importações atualizadas em {file_path}")]
+        return None, [(print_info, f"Nenhuma atualização necessária em {file_path}")]
+    
+    except (OSError, UnicodeDecodeError) as e:
+        return None, [(print_error, f"Erro ao atualizar importações em {file_path}: {e}")]
+
 def update_imports():
     """Atualiza as importações nos arquivos movidos"""
     print_step("Atualizando importações nos arquivos...")
     
+    prudentia_entries = scan_dir("prudentia")
     files_to_check = [
-        os.path.join("prudentia", "settings.py"),
-        os.path.join("prudentia", "urls.py"),
-        os.path.join("prudentia", "wsgi.py"),
-        os.path.join("prudentia", "asgi.py"),
-        os.path.join("prudentia", "celery.py")
+        os.path.join("prudentia", file) for file in DJANGO_FILES if file in prudentia_entries
     ]
     
-    for file_path in files_to_check:
-        if not os.path.exists(file_path):
-            continue
-            
-        try:
-            with open(file_path, "r") as f:
-                content = f.read()
-            
-            # Substituir importações absolutas por relativas
-            updated_content = content
-            
-            # Exemplo: from settings import XYZ -> from .settings import XYZ
-            for module in ["settings", "urls", "wsgi", "asgi", "celery"]:
-                updated_content = updated_content.replace(
-                    f"from {module} import", 
-                    f"from .{module} import"
-                )
-                updated_content = updated_content.replace(
-                    f"import {module}", 
-                    f"import .{module}"
-                )
-            
-            if updated_content != content:
-                with open(file_path, "w") as f:
-                    f.write(updated_content)
-                print_success(f"Importações atualizadas em {file_path}")
-            else:
-                print_info(f"Nenhuma atualização necessária em {file_path}")
-                
-        except Exception as e:
-            print_error(f"Erro ao atualizar importações em {file_path}: {e}")
+    run_parallel(_update_imports_one, files_to_check)
+    
+    return True
+
+def _read_records(stream, separator=b"\0", chunk_size=8192):
+    """Lê registros separados por separator de um stream binário, sob demanda"""
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+        *records, pending = pending.split(separator)
+        yield from records
+    if pending:
+        yield pending
+
+def git_status_entries(limit):
+    """
+    Lê o git status e retorna (sucesso, entradas, truncado)
+
+    Cada entrada é (XY, caminho). A saída é lida com -z: os caminhos chegam
+    sem aspas nem escapes, mesmo com espaços ou acentos. A leitura para após
+    limit entradas e o git é encerrado, sem acumular a saída inteira em memória.
+    """
+    # Só interessam os caminhos tocados pela reorganização: limitar o status a eles
+    # evita percorrer o restante da árvore (venv/, node_modules/...) atrás de
+    # arquivos não rastreados
+    argv = ["git", "status", "--porcelain=v1", "-z",
+            "--untracked-files=normal", "--ignore-submodules", "--", *GIT_PATHS]
+    try:
+        process = subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=COMMAND_ENV
+        )
+    except OSError:
+        return False, [], False
+    
+    entries = []
+    truncated = False
+    with process:
+        records = _read_records(process.stdout)
+        for record in records:
+            if len(entries) >= limit:
+                truncated = True
+                process.kill()
+                break
+            status, path = record[:2].decode(), os.fsdecode(record[3:])
+            entries.append((status, path))
+            # Renomeações/cópias: o registro seguinte é o caminho de origem
+            if "R" in status or "C" in status:
+                entries.append((status, os.fsdecode(next(records, b""))))
+    
+    if not truncated and process.returncode != 0:
+        return False, [], False
+    
+    return True, entries, truncated
+
+def has_commit_hooks(repo):
+    """Verifica se o repositório tem hooks de commit instalados (e executáveis)"""
+    try:
+        hooks_dir = repo.config["core.hooksPath"]
+    except KeyError:
+        hooks_dir = os.path.join(repo.path, "hooks")
+    hooks_dir = os.path.join(repo.workdir or ".", os.path.expanduser(hooks_dir))
+    
+    return any(
+        os.access(os.path.join(hooks_dir, hook), os.X_OK)
+        for hook in ("pre-commit", "prepare-commit-msg", "commit-msg", "post-commit")
+    )
+
+def commit_with_pygit2(paths, message):
+    """
+    Adiciona paths ao índice e faz o commit via libgit2, sem subprocessos
+
+    O libgit2 não executa hooks do git; por isso, se o repositório tiver hooks
+    de commit instalados (pre-commit, commit-msg...), este caminho não é usado.
+    Retorna False nesse caso, ou se o commit não puder ser feito assim (ex:
+    user.name/email não configurados), para que o chamador recorra ao git de
+    linha de comando, que executa os hooks normalmente.
+    """
+    try:
+        repo = pygit2.Repository(".")
+        if has_commit_hooks(repo):
+            return False
+        
+        index = repo.index
+        index.read()
+        # add_all inclui arquivos novos; update_all registra as remoções
+        index.add_all(paths)
+        index.update_all(paths)
+        index.write()
+        tree = index.write_tree()
+        
+        signature = repo.default_signature
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        repo.create_commit("HEAD", signature, signature, message, tree, parents)
+    except (pygit2.GitError, KeyError, ValueError):
+        return False
     
     return True
 
@@ -228,18 +463,22 @@ def commit_changes():
     """Faz commit das alterações"""
     print_step("Verificando alterações para commit...")
     
-    success, output = run_command("git status --porcelain")
+    success, entries, truncated = git_status_entries(MAX_STATUS_LINES)
     
     if not success:
         print_error("Erro ao verificar status do git.")
         return False
     
-    if not output.strip():
+    if not entries:
         print_info("Não há alterações para commit.")
         return True
     
     print_info("As seguintes alterações foram detectadas:")
-    print(output)
+    for status, path in entries:
+        stdout_buffer.write(f"{status} {path}")
+    if truncated:
+        print_info(f"... (exibindo apenas as primeiras {MAX_STATUS_LINES} alterações)")
+    stdout_buffer.flush()
     
     response = input("\nDeseja fazer commit dessas alterações? (s/N): ").strip().lower()
     
@@ -247,16 +486,24 @@ def commit_changes():
         print_info("Commit cancelado pelo usuário.")
         return True
     
+    # Só os caminhos que aparecem no status: um arquivo de GIT_PATHS que nunca
+    # existiu faria o git add falhar ("pathspec did not match")
+    paths = GIT_PATHS if truncated else list(dict.fromkeys(path for _, path in entries))
+    commit_message = "refactor: reorganize Django files into prudentia/ package"
+    
+    if pygit2 is not None and commit_with_pygit2(paths, commit_message):
+        print_success("Commit realizado com sucesso!")
+        return True
+    
     # Adicionar arquivos
-    success, _ = run_command("git add prudentia/ settings.py urls.py wsgi.py asgi.py celery.py")
+    success, _ = run_command(["git", "add", "--all", "--", *paths])
     
     if not success:
         print_error("Erro ao adicionar arquivos ao stage.")
         return False
     
     # Fazer commit
-    commit_message = "refactor: reorganize Django files into prudentia/ package"
-    success, _ = run_command(f'git commit -m "{commit_message}"')
+    success, _ = run_command(["git", "commit", "-m", commit_message])
     
     if not success:
         print_error("Erro ao fazer commit.")
@@ -272,35 +519,66 @@ def create_logs_media_dirs():
     dirs_to_create = ["logs", "media", "static"]
     
     for dir_name in dirs_to_create:
-        if os.path.exists(dir_name):
+        try:
+            os.mkdir(dir_name)
+            print_success(f"Diretório {dir_name}/ criado com sucesso.")
+        except FileExistsError:
             if os.path.isdir(dir_name):
                 print_info(f"Diretório {dir_name}/ já existe.")
             else:
                 print_error(f"{dir_name} existe, mas não é um diretório!")
-        else:
-            try:
-                os.mkdir(dir_name)
-                print_success(f"Diretório {dir_name}/ criado com sucesso.")
-            except Exception as e:
-                print_error(f"Erro ao criar diretório {dir_name}/: {e}")
+        except OSError as e:
+            print_error(f"Erro ao criar diretório {dir_name}/: {e}")
     
     return True
 
+def _create_migrations_one(app):
+    """Cria migrations/ e seu __init__.py para um app; retorna (None, mensagens)"""
+    messages = []
+    migrations_dir = os.path.join("apps", app, "migrations")
+    
+    try:
+        os.mkdir(migrations_dir)
+        messages.append((print_success, f"Diretório migrations/ criado para o app {app}."))
+    except FileExistsError:
+        pass
+    except OSError as e:
+        messages.append((print_error, f"Erro ao criar diretório migrations/ para {app}: {e}"))
+        return None, messages
+    
+    init_file = os.path.join(migrations_dir, "__init__.py")
+    try:
+        with open(init_file, "x"):
+            pass  # Criar arquivo vazio
+        messages.append(
+            (print_success, f"Arquivo __init__.py criado em migrations/ para o app {app}.")
+        )
+    except FileExistsError:
+        pass
+    except OSError as e:
+        messages.append((print_error, f"Erro ao criar __init__.py para {app}: {e}"))
+    
+    return None, messages
+
 def create_migrations_dirs():
     """Cria diretórios de migrations para os apps Django"""
     print_step("Criando diretórios de migrations para os apps...")
     
-    if not os.path.exists("apps"):
+    # Listar todos os apps; o tipo de cada entrada vem da própria leitura do
+    # diretório, sem um stat por app. __pycache__ e diretórios ocultos são
+    # descartados pelo nome, antes mesmo de consultar o tipo.
+    try:
+        with os.scandir("apps") as entries:
+            apps = [
+                entry.name
+                for entry in entries
+                if not entry.name.startswith(("__", "."))
+                and entry.is_dir(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
         print_info("Diretório apps/ não encontrado. Pulando criação de migrations.")
         return True
     
-    # Listar todos os apps
-    apps = []
-    for item in os.listdir("apps"):
-        app_dir = os.path.join("apps", item)
-        if os.path.isdir(app_dir) and not item.startswith("__"):
-            apps.append(item)
-    
     if not apps:
         print_info("Nenhum app Django encontrado.")
         return True
@@ -308,33 +586,63 @@ def create_migrations_dirs():
     print_info(f"Apps encontrados: {', '.join(apps)}")
     
     # Criar diretório migrations e __init__.py para cada app
-    for app in apps:
-        migrations_dir = os.path.join("apps", app, "migrations")
-        
-        if not os.path.exists(migrations_dir):
-            try:
-                os.mkdir(migrations_dir)
-                print_success(f"Diretório migrations/ criado para o app {app}.")
-            except Exception as e:
-                print_error(f"Erro ao criar diretório migrations/ para {app}: {e}")
-                continue
-        
-        init_file = os.path.join(migrations_dir, "__init__.py")
-        if not os.path.exists(init_file):
-            try:
-                with open(init_file, "w") as f:
-                    pass  # Criar arquivo vazio
-                print_success(f"Arquivo __init__.py criado em migrations/ para o app {app}.")
-            except Exception as e:
-                print_error(f"Erro ao criar __init__.py para {app}: {e}")
+    run_parallel(_create_migrations_one, apps)
     
     return True
 
+def imports_pending(file_path):
+    """Verifica se um arquivo movido ainda tem importações absolutas a reescrever"""
+    if not has_import_candidates(file_path):
+        return False
+    return IMPORT_RE.search(Path(file_path).read_text(encoding="utf-8")) is not None
+
+def already_reorganized():
+    """
+    Verifica se a reorganização já foi concluída, inclusive o commit
+
+    Além da estrutura final, exige que as importações dos arquivos movidos já
+    estejam reescritas e que o git status dos caminhos reorganizados esteja
+    limpo: uma execução anterior que moveu os arquivos mas falhou antes do
+    commit não é tratada como concluída. As checagens baratas vêm primeiro; o
+    git só é consultado quando todas passam.
+    """
+    root_entries = scan_dir(".")
+    if not all(
+        dir_name in root_entries and root_entries[dir_name].is_dir()
+        for dir_name in ("prudentia", "logs", "media", "static")
+    ):
+        return False
+    
+    prudentia_entries = scan_dir("prudentia")
+    if not (
+        "settings.py" in prudentia_entries
+        and "__init__.py" in prudentia_entries
+        and not any(file in root_entries for file in DJANGO_FILES)
+    ):
+        return False
+    
+    try:
+        if any(
+            imports_pending(os.path.join("prudentia", file))
+            for file in DJANGO_FILES
+            if file in prudentia_entries
+        ):
+            return False
+    except (OSError, UnicodeDecodeError):
+        return False
+    
+    success, entries, _ = git_status_entries(1)
+    return success and not entries
+
 def main():
     """Função principal"""
     print_header("REORGANIZAÇÃO DO REPOSITÓRIO PRUDENTIA")
     print_info("Este script reorganiza a estrutura do repositório para o padrão Django.")
     
+    if already_reorganized():
+        print_success("O repositório já está reorganizado. Nada a fazer.")
+        return 0
+    
     # Verificar se estamos em um repositório git
     if not check_git_repo():
         return 1
@@ -383,4 +691,8 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        exit_code = main()
+    finally:
+        stdout_buffer.flush()
+    sys.exit(exit_code)